@@ -1,45 +1,126 @@
-import io
-import sys
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
+import torch
 from fastapi import FastAPI
 from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+from transformers.utils import logging as hf_logging
 
 from docusight.config import settings
 from docusight.logging import logger
 
 
+class HuggingFaceLogHandler(logging.Handler):
+    """
+    Forwards log records emitted by HuggingFace transformers to the app logger.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        logger.log(record.levelno, f"HuggingFace pipeline: {record.getMessage()}")
+
+
 def setup_pipeline(app: FastAPI):
-    stdout_buffer = io.StringIO()
-    old_stdout = sys.stdout
-    sys.stdout = stdout_buffer
+    # resolve device here so torch is only probed when the pipeline is set up
+    if settings.GPU_DEVICE is None:
+        settings.GPU_DEVICE = 0 if torch.cuda.is_available() else -1
+
+    # route HuggingFace output through the app logger while loading the pipeline
+    hf_handler = HuggingFaceLogHandler()
+    hf_logging.disable_default_handler()
+    hf_logging.add_handler(hf_handler)
     try:
-        tokenizer = AutoTokenizer.from_pretrained(settings.CLASSIFICATION_MODEL_NAME)
+        tokenizer = AutoTokenizer.from_pretrained(
+            settings.CLASSIFICATION_MODEL_NAME, use_fast=True
+        )
         model = AutoModelForSequenceClassification.from_pretrained(
-            settings.CLASSIFICATION_MODEL_NAME
+            settings.CLASSIFICATION_MODEL_NAME, dtype=get_model_dtype()
         )
+        if settings.GPU_DEVICE < 0 and settings.CLASSIFICATION_QUANTIZE_CPU:
+            # int8 weights for the linear layers (activations are quantized on the fly)
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        tokenizer_kwargs = {
+            "truncation": True,
+            "max_length": settings.CLASSIFICATION_MAX_LENGTH,
+        }
+        if settings.GPU_DEVICE >= 0:
+            # fixed input shapes let the compiled model reuse its captured CUDA graph
+            tokenizer_kwargs["padding"] = "max_length"
 
         sentiment_classifier = pipeline(
             "sentiment-analysis",
             model=model,
             tokenizer=tokenizer,
             device=settings.GPU_DEVICE,
+            batch_size=settings.CLASSIFICATION_BATCH_SIZE,
+            **tokenizer_kwargs,
+        )
+
+        # dedicated inference threads, so CPU-heavy inference does not starve the shared threadpool
+        inference_executor = ThreadPoolExecutor(
+            max_workers=settings.CLASSIFICATION_WORKERS,
+            thread_name_prefix="inference",
         )
+        if settings.GPU_DEVICE < 0 and settings.CLASSIFICATION_WORKERS > 1:
+            # split torch's intra-op threads over the inference threads to avoid oversubscription
+            torch.set_num_threads(
+                max(1, torch.get_num_threads() // settings.CLASSIFICATION_WORKERS)
+            )
+
+        # warm up the pipeline so compilation/CUDA JIT is not paid on the first request
+        warmup_batch = ["warmup"] * settings.CLASSIFICATION_BATCH_SIZE
+
+        def warmup(passes: int):
+            for _ in range(passes):
+                inference_executor.submit(sentiment_classifier, warmup_batch).result()
+
+        # pre-compile model for faster inference (PyTorch 2.0+, CUDA > 7.0)
+        # NOTE: compilation is lazy, backend failures only surface on the first forward pass (the warm-up)
+        compiled = False
+        if settings.GPU_DEVICE >= 0:
+            eager_model = model
+            try:
+                sentiment_classifier.model = torch.compile(
+                    model, mode="reduce-overhead"
+                )
+                compiled = True
 
-        # # TODO: pre-compile model for faster inference (PyTorch 2.0+, CUDA > 7.0)
-        # model = torch.compile(model)
-        # sentiment_classifier.model = model
+                # NOTE: a compiled model is warmed up twice so the CUDA graph gets captured
+                warmup(2)
+            except Exception as e:
+                logger.warning(f"torch.compile unavailable, running eagerly: {e}")
+                sentiment_classifier.model = eager_model
+                compiled = False
+        if not compiled:
+            warmup(1)
 
         # Store in app state for access in endpoints
         app.state.sentiment_classifier = sentiment_classifier
+        app.state.inference_executor = inference_executor
 
         logger.info(
             f"Loaded classification model '{settings.CLASSIFICATION_MODEL_NAME}'"
         )
 
     finally:
-        sys.stdout = old_stdout
+        hf_logging.remove_handler(hf_handler)
+        hf_logging.enable_default_handler()
+
+
+def get_model_dtype() -> torch.dtype:
+    """
+    Resolve the dtype to load the classification model in.
+
+    Half precision is only used on GPU; on CPU the model always runs in float32.
+    With "auto", bfloat16 is preferred where supported (Ampere+), otherwise float16.
 
-    # Log any output from pipeline instantiation
-    cuda_message = stdout_buffer.getvalue().strip()
-    if cuda_message:
-        logger.info(f"HuggingFace pipeline: {cuda_message}")
+    Returns:
+        torch.dtype: The dtype for the classification model weights.
+    """
+    if settings.GPU_DEVICE < 0:
+        return torch.float32
+    if settings.CLASSIFICATION_DTYPE == "auto":
+        return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    return getattr(torch, settings.CLASSIFICATION_DTYPE)
@@ -1,10 +1,14 @@
 import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
-import torch
 from pydantic import ConfigDict, field_validator
 from pydantic_settings import BaseSettings
 
+# Dropbox app keys/secrets are 15-character lowercase alphanumeric strings
+DROPBOX_KEY_PATTERN = re.compile(r"[a-z0-9]{15}")
+
 
 class Settings(BaseSettings):
     """
@@ -25,7 +29,7 @@ class Settings(BaseSettings):
 
     @field_validator("DROPBOX_APP_KEY", "DROPBOX_APP_SECRET")
     def not_placeholder(cls, v):
-        if not re.fullmatch(r"[a-z0-9]{15}", v):
+        if not DROPBOX_KEY_PATTERN.fullmatch(v):
             raise ValueError(
                 "Dropbox app keys must be 15-character lowercase alphanumeric strings. Current value: "
                 + v
@@ -38,11 +42,25 @@ class Settings(BaseSettings):
     DROPBOX_APP_SECRET: str
     SESSION_SECRET_KEY: str
 
+    # Database connection pool settings
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds
+    DATABASE_POOL_PRE_PING: bool = False  # stale connections are retired by recycling
+
     # Classification pipeline settings
     PYTORCH_CUDA_VERSION: str
     CLASSIFICATION_MODEL_NAME: str
-    GPU_DEVICE: int = 0 if torch.cuda.is_available() else -1
+    GPU_DEVICE: Optional[int] = None  # resolved in setup_pipeline (-1 for CPU)
     CLASSIFICATION_BATCH_SIZE: int = 16
+    CLASSIFICATION_WORKERS: int = 1  # dedicated inference threads
+    CLASSIFICATION_DTYPE: str = "auto"  # "auto", "float16", "bfloat16" or "float32"
+    CLASSIFICATION_QUANTIZE_CPU: bool = False  # int8 dynamic quantization on CPU
+    CLASSIFICATION_MAX_LENGTH: int = (
+        512  # tokens per document (longer inputs are truncated)
+    )
+    # bytes read per document (well above CLASSIFICATION_MAX_LENGTH tokens)
+    CLASSIFICATION_MAX_TEXT_BYTES: int = 64 * 1024  # 64 KB
 
     # Dropbox authentication redirect URI
     DROPBOX_REDIRECT_URI: str = "authentication/callback"
@@ -50,9 +68,38 @@ class Settings(BaseSettings):
     # Dropbox account ID key in session
     DROPBOX_ACCOUNT_ID_SESSION_KEY: str = "dropbox_account_id"
 
-    # File read chunk size (in bytes) when processing large zipped archives
-    ZIP_FILE_READ_CHUNK_SIZE: int = 1024 * 1024  # 1 MB
+    # Time (in seconds) a validated Dropbox client is reused before re-validating
+    DROPBOX_CLIENT_CACHE_TTL: int = 3600
+
+    # Refresh access tokens of cached Dropbox clients in the background within this margin (in seconds) of expiry
+    DROPBOX_TOKEN_EXPIRY_MARGIN: int = 300
+
+    # Maximum number of files uploaded to Dropbox concurrently
+    DROPBOX_UPLOAD_CONCURRENCY: int = 16
+
+    # Maximum number of files downloaded from Dropbox concurrently
+    DROPBOX_DOWNLOAD_CONCURRENCY: int = 16
+
+    # Files below this size (in bytes) are uploaded to Dropbox in a single call (Dropbox API limit)
+    DROPBOX_SINGLE_UPLOAD_LIMIT: int = 150 * 1024 * 1024  # 150 MB
+
+    # Chunk size (in bytes) when streaming files into a Dropbox upload session
+    DROPBOX_UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024  # 8 MB
+
+    # Maximum number of paths per Dropbox delete batch (Dropbox API limit)
+    DROPBOX_DELETE_BATCH_SIZE: int = 1000
+
+    # Time (in seconds) between status checks of a Dropbox delete batch job
+    DROPBOX_DELETE_POLL_INTERVAL: float = 1.0
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the (cached) application settings, parsed and validated once per process.
+    """
+    return Settings()
 
 
 # Create a single instance to import everywhere
-settings = Settings()
+settings = get_settings()
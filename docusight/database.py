@@ -1,11 +1,29 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from docusight.config import settings
 from docusight.models import Base, User
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Queue pool settings (in-memory SQLite uses a single static connection, which takes none)
+database_url = make_url(settings.DATABASE_URL)
+pool_kwargs = {}
+if not (
+    database_url.get_backend_name() == "sqlite"
+    and database_url.database in (None, "", ":memory:")
+):
+    pool_kwargs = dict(
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    )
+
+engine = create_async_engine(
+    database_url,
+    echo=False,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    **pool_kwargs,
+)
+async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
 async def get_db():
@@ -1,8 +1,16 @@
-from dropbox import Dropbox
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import AsyncIterator, Optional
+
+from dropbox import Dropbox, create_session, files
 from dropbox.exceptions import AuthError
 from dropbox.oauth import DropboxOAuth2Flow
+from dropbox.session import API_HOST, DEFAULT_TIMEOUT
 from fastapi import HTTPException
 from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -11,10 +19,39 @@ from docusight.database import async_session
 from docusight.logging import logger
 from docusight.models import User
 
+# HTTP session shared by all Dropbox clients, with a connection pool sized for concurrent transfers
+_dropbox_http_session = create_session(
+    max_connections=max(
+        settings.DROPBOX_UPLOAD_CONCURRENCY, settings.DROPBOX_DOWNLOAD_CONCURRENCY
+    )
+)
 
-def get_auth_flow(base_url: str, session: dict) -> DropboxOAuth2Flow:
+# Dropbox OAuth2 token endpoint, used to refresh access tokens
+DROPBOX_TOKEN_URL = f"https://{API_HOST}/oauth2/token"
+
+# Validated Dropbox clients per account ID, with the access token they use, its expiration and their cache time
+_dropbox_client_cache: dict[str, tuple[Dropbox, str, Optional[datetime], float]] = {}
+
+# In-flight access token refreshes per account ID
+_token_refresh_tasks: dict[str, asyncio.Task] = {}
+
+
+class TokenState(Enum):
+    """
+    Freshness of a Dropbox access token: stale tokens are still valid, but about to expire.
+    """
+
+    FRESH = "fresh"
+    STALE = "stale"
+    EXPIRED = "expired"
 
-    return DropboxOAuth2Flow(
+
+def get_auth_flow(base_url: str, session: dict) -> DropboxOAuth2Flow:
+    """
+    Build the Dropbox OAuth2 flow for a request session.
+    The flow is bound to the (per-request) session, but reuses the shared HTTP session for the token exchange.
+    """
+    auth_flow = DropboxOAuth2Flow(
         consumer_key=settings.DROPBOX_APP_KEY,
         consumer_secret=settings.DROPBOX_APP_SECRET,
         redirect_uri=str(base_url) + settings.DROPBOX_REDIRECT_URI,
@@ -22,20 +59,42 @@ def get_auth_flow(base_url: str, session: dict) -> DropboxOAuth2Flow:
         csrf_token_session_key="dropbox-auth-csrf-token",
         token_access_type="offline",
     )
+    auth_flow.requests_session = _dropbox_http_session
+    return auth_flow
 
 
 async def get_dropbox_client(user: User) -> Dropbox:
     """
     Return a Dropbox client for the current user using the access token stored in session.
     Assumes session['dropbox_access_token'] is set after OAuth2 callback.
+
+    Validated clients are cached per user, so the validation round-trip to Dropbox is only made
+    on a cache miss or after the cache TTL has passed. Access tokens of cached clients are refreshed
+    stale-while-revalidate: a stale token is refreshed in the background, only an expired one blocks.
     """
+    cached = _dropbox_client_cache.get(user.dropbox_account_id)
+    if cached:
+        dbx, access_token, expiration, cached_at = cached
+        if (
+            access_token == user.dropbox_access_token
+            and time.monotonic() - cached_at < settings.DROPBOX_CLIENT_CACHE_TTL
+        ):
+            token_state = get_token_state(expiration)
+            if token_state is TokenState.STALE:
+                schedule_token_refresh(user)
+            elif token_state is TokenState.EXPIRED:
+                await schedule_token_refresh(user)
+
+            # NOTE: a refreshed client replaces the cached one, a client whose refresh failed is rebuilt
+            cached = _dropbox_client_cache.get(user.dropbox_account_id)
+            if cached:
+                return cached[0]
+
     try:
-        dbx = Dropbox(
-            oauth2_access_token=user.dropbox_access_token,
-            oauth2_access_token_expiration=user.dropbox_access_token_expiration,
-            oauth2_refresh_token=user.dropbox_refresh_token,
-            app_key=settings.DROPBOX_APP_KEY,
-            app_secret=settings.DROPBOX_APP_SECRET,
+        dbx = create_dropbox_client(
+            user.dropbox_access_token,
+            user.dropbox_refresh_token,
+            user.dropbox_access_token_expiration,
         )
         await run_in_threadpool(dbx.users_get_current_account)
     except AuthError as e:
@@ -43,9 +102,137 @@ async def get_dropbox_client(user: User) -> Dropbox:
         raise HTTPException(
             status_code=401, detail=f"Invalid or expired Dropbox access token: {e}."
         )
+    cache_dropbox_client(
+        user.dropbox_account_id,
+        dbx,
+        user.dropbox_access_token,
+        user.dropbox_access_token_expiration,
+    )
     return dbx
 
 
+def create_dropbox_client(
+    access_token: str,
+    refresh_token: Optional[str],
+    access_token_expiration: Optional[datetime],
+) -> Dropbox:
+    """
+    Create a Dropbox client on the shared HTTP session, so connections are kept alive across clients.
+    """
+    return Dropbox(
+        oauth2_access_token=access_token,
+        oauth2_access_token_expiration=access_token_expiration,
+        oauth2_refresh_token=refresh_token,
+        app_key=settings.DROPBOX_APP_KEY,
+        app_secret=settings.DROPBOX_APP_SECRET,
+        session=_dropbox_http_session,
+    )
+
+
+def cache_dropbox_client(
+    account_id: str,
+    dbx: Dropbox,
+    access_token: str,
+    access_token_expiration: Optional[datetime],
+):
+    """
+    Cache a validated Dropbox client for an account, together with the access token it uses and its expiration.
+    """
+    _dropbox_client_cache[account_id] = (
+        dbx,
+        access_token,
+        access_token_expiration,
+        time.monotonic(),
+    )
+
+
+def get_token_state(expiration: Optional[datetime]) -> TokenState:
+    """
+    Determine the state of an access token from its expiration (naive UTC, like the SDK's).
+    """
+    if expiration is None:
+        return TokenState.FRESH
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if expiration <= now:
+        return TokenState.EXPIRED
+    if expiration - now < timedelta(seconds=settings.DROPBOX_TOKEN_EXPIRY_MARGIN):
+        return TokenState.STALE
+    return TokenState.FRESH
+
+
+def schedule_token_refresh(user: User) -> asyncio.Task:
+    """
+    Refresh the access token of a user's cached Dropbox client in a background task.
+    Only one refresh is in flight per account; concurrent callers share its task.
+    """
+    account_id = user.dropbox_account_id
+    task = _token_refresh_tasks.get(account_id)
+    if task is None or task.done():
+        task = asyncio.create_task(
+            refresh_access_token(account_id, user.dropbox_refresh_token)
+        )
+        _token_refresh_tasks[account_id] = task
+    return task
+
+
+async def refresh_access_token(account_id: str, refresh_token: str):
+    """
+    Refresh the access token of an account, replacing its cached client with one using the new token.
+    The new token is stored with the user, so it outlives the cache; the client is dropped from the cache on failure.
+    """
+    try:
+        access_token, expiration = await run_in_threadpool(
+            request_access_token, refresh_token
+        )
+        dbx = create_dropbox_client(access_token, refresh_token, expiration)
+        await save_access_token(account_id, access_token, expiration)
+    except Exception as e:
+        logger.error(f"Failed to refresh Dropbox access token of {account_id}: {e}")
+        _dropbox_client_cache.pop(account_id, None)
+        return
+    cache_dropbox_client(account_id, dbx, access_token, expiration)
+
+
+def request_access_token(refresh_token: str) -> tuple[str, datetime]:
+    """
+    Request a new access token from the Dropbox token endpoint (blocking), on the shared HTTP session.
+
+    Returns:
+        tuple[str, datetime]: The access token and its expiration (naive UTC).
+    """
+    response = _dropbox_http_session.post(
+        DROPBOX_TOKEN_URL,
+        data={
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": settings.DROPBOX_APP_KEY,
+            "client_secret": settings.DROPBOX_APP_SECRET,
+        },
+        timeout=DEFAULT_TIMEOUT,
+    )
+    response.raise_for_status()
+    token = response.json()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return token["access_token"], now + timedelta(seconds=int(token["expires_in"]))
+
+
+async def save_access_token(account_id: str, access_token: str, expiration: datetime):
+    """
+    Store a (refreshed) access token and its expiration with the user of a Dropbox account.
+    """
+    # NOTE: a short write transaction of its own, independent of any request session
+    async with async_session() as db:
+        await db.execute(
+            update(User)
+            .where(User.dropbox_account_id == account_id)
+            .values(
+                dropbox_access_token=access_token,
+                dropbox_access_token_expiration=expiration,
+            )
+        )
+        await db.commit()
+
+
 async def get_user(db: AsyncSession, session: dict) -> User:
     """
     Retrieve the user ID from the database using the session.
@@ -75,23 +262,92 @@ def get_dropbox_account_id(session: dict) -> str:
 
 
 async def cleanup_dropbox_files():
+    """
+    Delete all files in the Dropbox upload directory of every user, cleaning up users concurrently.
+    """
+    # NOTE: release the connection before the (long) Dropbox cleanup starts
     async with async_session() as db:
         result = await db.execute(select(User))
         users: list[User] = result.scalars().all()
-        for user in users:
-            try:
-                dropbox_client = await get_dropbox_client(user)
-
-                # List all files in the upload directory
-                res = dropbox_client.files_list_folder(settings.UPLOAD_DIR)
-                for entry in res.entries:
-                    if hasattr(entry, "path_display"):
-                        dropbox_client.files_delete_v2(entry.path_display)
-                # If there are more files, continue listing and deleting
-                while res.has_more:
-                    res = dropbox_client.files_list_folder_continue(res.cursor)
-                    for entry in res.entries:
-                        if hasattr(entry, "path_display"):
-                            dropbox_client.files_delete_v2(entry.path_display)
-            except Exception as e:
-                logger.error(f"Error cleaning up Dropbox files for user {user}: {e}")
+    await asyncio.gather(*(cleanup_user_dropbox_files(user) for user in users))
+
+
+async def cleanup_user_dropbox_files(user: User):
+    """
+    Delete all files in the Dropbox upload directory of a single user using batch deletes.
+    """
+    try:
+        dropbox_client = await get_dropbox_client(user)
+
+        # Stream entries of the upload directory into fixed-size delete batches
+        batch_size = settings.DROPBOX_DELETE_BATCH_SIZE
+        batch: list[files.DeleteArg] = []
+        async for entry in iter_folder_entries(dropbox_client, settings.UPLOAD_DIR):
+            if hasattr(entry, "path_display"):
+                batch.append(files.DeleteArg(entry.path_display))
+            if len(batch) == batch_size:
+                await delete_batch(dropbox_client, batch)
+                batch = []
+        if batch:
+            await delete_batch(dropbox_client, batch)
+    except Exception as e:
+        logger.error(f"Error cleaning up Dropbox files for user {user}: {e}")
+
+
+async def delete_dropbox_files(dropbox_client: Dropbox, dropbox_paths: list[str]):
+    """
+    Delete the given Dropbox paths in fixed-size delete batches.
+    """
+    batch_size = settings.DROPBOX_DELETE_BATCH_SIZE
+    for i in range(0, len(dropbox_paths), batch_size):
+        batch = [files.DeleteArg(path) for path in dropbox_paths[i : i + batch_size]]
+        await delete_batch(dropbox_client, batch)
+
+
+async def delete_batch(dropbox_client: Dropbox, batch: list[files.DeleteArg]):
+    """
+    Delete a batch of Dropbox paths, polling the (async) delete job until it finishes and logging failed entries.
+    """
+    launch = await run_in_threadpool(dropbox_client.files_delete_batch, batch)
+    if launch.is_complete():
+        result = launch.get_complete()
+    elif launch.is_async_job_id():
+        job_id = launch.get_async_job_id()
+        while True:
+            status = await run_in_threadpool(
+                dropbox_client.files_delete_batch_check, job_id
+            )
+            if not status.is_in_progress():
+                break
+            await asyncio.sleep(settings.DROPBOX_DELETE_POLL_INTERVAL)
+        if not status.is_complete():
+            error = status.get_failed() if status.is_failed() else status
+            logger.error(f"Dropbox delete batch job {job_id} failed: {error}")
+            return
+        result = status.get_complete()
+    else:
+        logger.error(f"Unexpected Dropbox delete batch result: {launch}")
+        return
+
+    for arg, entry in zip(batch, result.entries):
+        if entry.is_failure():
+            logger.error(
+                f"Failed to delete {arg.path} from Dropbox: {entry.get_failure()}"
+            )
+
+
+async def iter_folder_entries(
+    dropbox_client: Dropbox, path: str
+) -> AsyncIterator[files.Metadata]:
+    """
+    Yield all entries of a Dropbox folder, fetching pages lazily as they are consumed.
+    """
+    res = await run_in_threadpool(dropbox_client.files_list_folder, path)
+    for entry in res.entries:
+        yield entry
+    while res.has_more:
+        res = await run_in_threadpool(
+            dropbox_client.files_list_folder_continue, res.cursor
+        )
+        for entry in res.entries:
+            yield entry
@@ -1,26 +1,63 @@
+import asyncio
 import csv
+import io
+import multiprocessing
 import os
 import shutil
+import tempfile
 import uuid
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Callable, Iterator, Optional, TypeVar
+from xml.etree import ElementTree
 
-import aiofiles
-import pypdf
-from bs4 import BeautifulSoup
-from docx import Document as DocxDocument
+import pymupdf
 from dropbox import Dropbox, files
-from fastapi import HTTPException, UploadFile
+from fastapi import BackgroundTasks, HTTPException, UploadFile
 from fastapi.concurrency import run_in_threadpool
+from selectolax.lexbor import LexborHTMLParser
+from sqlalchemy import Select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased, joinedload
 from striprtf.striprtf import rtf_to_text
 
 from docusight.config import settings
+from docusight.dropbox import delete_dropbox_files
 from docusight.logging import logger
 from docusight.models import Document, Folder, User
 
+T = TypeVar("T")
+
+# WordprocessingML tags used to extract text from .docx files
+DOCX_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCX_PARAGRAPH_TAG = DOCX_NAMESPACE + "p"
+DOCX_TEXT_TAG = DOCX_NAMESPACE + "t"
+DOCX_TAB_TAG = DOCX_NAMESPACE + "tab"
+DOCX_BREAK_TAGS = {DOCX_NAMESPACE + "br", DOCX_NAMESPACE + "cr"}
+
+# Start method of the file parsing workers (forking the multi-threaded app process can deadlock)
+PROCESS_POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def create_process_pool() -> ProcessPoolExecutor:
+    """
+    Creates the pool of worker processes for CPU-bound file parsing (workers are started on demand).
+    """
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context(PROCESS_POOL_START_METHOD),
+    )
+
+
+# Shared worker processes for CPU-bound file parsing (created on first use, replaced if a worker dies)
+# NOTE: not created at import, since the worker processes import this module as well
+process_pool: Optional[ProcessPoolExecutor] = None
+
 
 class MetaDict(dict):
     filename: str
@@ -28,12 +65,24 @@ class MetaDict(dict):
     size: int
     created: float
     modified: float
+    plain_text_size: Optional[int]
 
     def __init__(
-        self, filename: str, path: str, size: int, created: float, modified: float
+        self,
+        filename: str,
+        path: str,
+        size: int,
+        created: float,
+        modified: float,
+        plain_text_size: Optional[int] = None,
     ):
         super().__init__(
-            filename=filename, path=path, size=size, created=created, modified=modified
+            filename=filename,
+            path=path,
+            size=size,
+            created=created,
+            modified=modified,
+            plain_text_size=plain_text_size,
         )
 
     def __getattr__(self, item):
@@ -46,15 +95,19 @@ async def add_zipped_folder_to_database(
     dropbox_client: Dropbox,
     user: User,
     drill: bool,
+    background_tasks: BackgroundTasks,
 ) -> Folder:
     """
-    Extracts a zipped folder, adds its contents to the database, uploads files to Dropbox, and cleans up temporary files.
+    Extracts a zipped folder, uploads files to Dropbox, adds its contents to the database, and cleans up temporary files.
+    Temporary files are removed in a background task, after the response has been sent.
+    If the folder cannot be added to the database, the files uploaded to Dropbox are deleted again.
 
     Args:
         request (Request): FastAPI request object.
         zipped_folder (UploadFile): The uploaded zipped folder (.zip file).
         db (AsyncSession): Database session.
         drill (bool): Whether to recursively add subfolders.
+        background_tasks (BackgroundTasks): Tasks run after the response is sent.
 
     Returns:
         Folder: The Folder ORM instance added to the database.
@@ -62,56 +115,104 @@ async def add_zipped_folder_to_database(
     # construct temp paths
     tmp_dir = generate_tmp_dir(user)
     os.makedirs(tmp_dir, exist_ok=True)
+    tmp_client_dir = (Path(tmp_dir) / zipped_folder.filename).with_suffix("")
+    dropbox_paths = {}
     try:
-        tmp_zipped_folder_path = Path(tmp_dir) / zipped_folder.filename
-        tmp_client_dir = tmp_zipped_folder_path.with_suffix("")
-
         # extract zip to temp directory
-        await write_zip_in_chunks(zipped_folder, tmp_zipped_folder_path)
-        await run_in_threadpool(extract_zip, tmp_zipped_folder_path)
-        await delete_zipfile(tmp_zipped_folder_path)
+        extracted_paths = await run_in_threadpool(
+            extract_zip, zipped_folder.file, tmp_dir
+        )
 
         # convert files to plain text (+ overwrite paths)
-        tmp_client_paths = [Path(p) for p in tmp_client_dir.rglob("*.*")]
+        tmp_client_paths = list(iter_supported_files(extracted_paths, tmp_client_dir))
         tmp_client_txt_file_map = await convert_files_to_plain_text(
             tmp_client_paths, tmp_dir
         )
 
-        # add folder to database
+        # upload plain text paths to dropbox (before any database writes, so no connection is held meanwhile)
+        tmp_client_txt_files = list(tmp_client_txt_file_map.keys())
+        tmp_client_txt_sizes = {
+            path: meta.plain_text_size for path, meta in tmp_client_txt_file_map.items()
+        }
+        dropbox_paths = await upload_files_to_dropbox(
+            dropbox_client, tmp_client_txt_files, tmp_dir, tmp_client_txt_sizes
+        )
+
+        # add folder to database and commit it (in one short write transaction, Dropbox paths included)
         folder = await add_folder_to_database(
             current_dir=tmp_client_dir,
             tmp_dir=tmp_dir,
             db=db,
             user_id=user.id,
             drill=drill,
-            original_file_map=tmp_client_txt_file_map,
+            original_file_map={
+                str(path): meta for path, meta in tmp_client_txt_file_map.items()
+            },
+            dropbox_path_map={
+                str(tmp_dir / relative_path): dropbox_path
+                for relative_path, dropbox_path in dropbox_paths.items()
+            },
         )
+        await db.commit()
 
-        # upload plain text paths to dropbox
-        tmp_client_txt_files = list(tmp_client_txt_file_map.keys())
-        dropbox_paths = await upload_files_to_dropbox(
-            dropbox_client, tmp_client_txt_files, tmp_dir
-        )
-        for relative_path, dropbox_path in dropbox_paths.items():
-            local_txt_path = tmp_dir / relative_path
-            original_meta = tmp_client_txt_file_map.get(local_txt_path)
-            document = await get_document_by_path(str(original_meta.path), db, user)
-            if document:
-                document.dropbox_path = dropbox_path
-                db.add(document)
-
-        # remove temp client directory
-        await run_in_threadpool(shutil.rmtree, tmp_client_dir)
+        # remove temp client directory (after the response is sent)
+        background_tasks.add_task(shutil.rmtree, tmp_client_dir, ignore_errors=True)
 
     except Exception as e:
         logger.error(f"Error adding zipped folder to database: {e}")
-        await run_in_threadpool(shutil.rmtree, tmp_client_dir)
+        await db.rollback()
+
+        # delete the uploaded files again, no document refers to them
+        if dropbox_paths:
+            try:
+                await delete_dropbox_files(dropbox_client, list(dropbox_paths.values()))
+            except Exception as cleanup_error:
+                logger.error(f"Error deleting uploaded Dropbox files: {cleanup_error}")
+
+        await run_in_threadpool(shutil.rmtree, tmp_client_dir, ignore_errors=True)
         raise HTTPException(
             status_code=500, detail="Failed to process and add zipped folder"
         )
     return folder
 
 
+async def run_in_process_pool(func: Callable[..., T], *args) -> T:
+    """
+    Runs a (picklable) function in the shared process pool without blocking the event loop.
+    If the pool broke (a worker died), it is replaced and the function is retried once.
+
+    Args:
+        func (Callable): Top-level function to run.
+        *args: Positional arguments for the function.
+
+    Returns:
+        The return value of the function.
+    """
+    global process_pool
+    loop = asyncio.get_running_loop()
+    if process_pool is None:
+        process_pool = create_process_pool()
+    pool = process_pool
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # a worker died (e.g. a parser crash), replace the pool and retry once
+        # NOTE: concurrent callers on the same broken pool only replace it once
+        if process_pool is pool:
+            logger.warning("File parsing process pool is broken, restarting it.")
+            process_pool = create_process_pool()
+            pool.shutdown(wait=False)
+        return await loop.run_in_executor(process_pool, func, *args)
+
+
+def shutdown_process_pool():
+    """
+    Stops the file parsing worker processes (if any were started).
+    """
+    if process_pool is not None:
+        process_pool.shutdown()
+
+
 def generate_tmp_dir(user: User) -> Path:
     """
     Generates a temporary directory path for a user based on their ID and display name.
@@ -125,42 +226,64 @@ def generate_tmp_dir(user: User) -> Path:
     return Path(settings.TEMP_DIR) / f"{user.id}_{user_name_fmt}"
 
 
-async def delete_zipfile(zip_path: Path):
+def extract_zip(zip_file: BinaryIO, dest_dir: Path) -> list[Path]:
     """
-    Asynchronously deletes a zip file from disk.
+    Extracts a zip file (e.g. the spooled upload) into a directory.
+    The file is spooled to disk once, after which its members are extracted in parallel threads,
+    each reading through a ZipFile handle of its own (a shared handle serializes all reads).
 
     Args:
-        zip_path (Path): Path to the zip file to delete.
-    """
-    if zip_path.exists():
-        await run_in_threadpool(zip_path.unlink)
-
+        zip_file (BinaryIO): Zip file object to extract.
+        dest_dir (Path): Directory to extract the members into.
 
-async def write_zip_in_chunks(upload_file: UploadFile, dest_path: Path):
+    Returns:
+        list[Path]: Paths of the extracted files.
     """
-    Asynchronously writes an uploaded zip file to disk in chunks.
-
-    Args:
-        upload_file (UploadFile): The uploaded zip file.
-        dest_path (Path): Destination path to write the file.
-    """
-    with open(dest_path, "wb") as f:
-        while True:
-            chunk = await upload_file.read(settings.ZIP_FILE_READ_CHUNK_SIZE)
-            if not chunk:
-                break
-            f.write(chunk)
+    with tempfile.TemporaryDirectory() as spool_dir:
+        zip_path = Path(spool_dir) / "upload.zip"
+        zip_file.seek(0)
+        with open(zip_path, "wb") as spooled_file:
+            shutil.copyfileobj(zip_file, spooled_file)
+        return extract_zip_path(zip_path, dest_dir)
 
 
-def extract_zip(tmp_zipped_folder_path: Path):
+def extract_zip_path(zip_path: Path, dest_dir: Path) -> list[Path]:
     """
-    Extracts a zip file to a directory with the same name (without .zip).
+    Extracts a zip file on disk into a directory, with one ZipFile handle per worker thread.
 
     Args:
-        tmp_zipped_folder_path (Path): Path to the zip file to extract.
+        zip_path (Path): Path of the zip file to extract.
+        dest_dir (Path): Directory to extract the members into.
+
+    Returns:
+        list[Path]: Paths of the extracted files.
     """
-    with zipfile.ZipFile(tmp_zipped_folder_path, "r") as zip_ref:
-        zip_ref.extractall(tmp_zipped_folder_path.parent)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        members = zip_ref.infolist()
+
+    # create directories up front, so workers do not race on creating them
+    root = dest_dir.resolve()
+    for member in members:
+        target = (dest_dir / member.filename).resolve()
+        if target.is_relative_to(root):
+            target = target if member.is_dir() else target.parent
+            os.makedirs(target, exist_ok=True)
+
+    def extract_members(worker_members: list[zipfile.ZipInfo]) -> list[Path]:
+        with zipfile.ZipFile(zip_path, "r") as worker_zip:
+            return [Path(worker_zip.extract(m, dest_dir)) for m in worker_members]
+
+    # deal the files out over the workers (round-robin, so large and small files are mixed)
+    # NOTE: decompression releases the GIL, so one worker per core
+    file_members = [member for member in members if not member.is_dir()]
+    max_workers = min(32, os.cpu_count() or 1, len(file_members) or 1)
+    worker_members = [file_members[i::max_workers] for i in range(max_workers)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [
+            path
+            for paths in executor.map(extract_members, worker_members)
+            for path in paths
+        ]
 
 
 async def convert_files_to_plain_text(
@@ -168,6 +291,7 @@ async def convert_files_to_plain_text(
 ) -> dict[Path, MetaDict]:
     """
     Converts multiple files to plain text if supported. Deletes old files and saves plain text versions.
+    Files are parsed in parallel across worker processes, as the parsers are CPU-bound.
 
     Supported types: .txt, .docx, .pdf, .csv, .rtf, .html
 
@@ -176,96 +300,164 @@ async def convert_files_to_plain_text(
     Returns:
         dict[Path, dict]: Mapping of plain text file paths to original file metadata.
     """
-    plain_text_files = {}
-    for path in paths:
-        text = await file_to_plain_text(path)
+    if not paths:
+        return {}
+
+    # parse files in parallel
+    texts = await asyncio.gather(
+        *(run_in_process_pool(file_to_plain_text, path) for path in paths)
+    )
 
+    tmp_prefix_length = len(str(tmp_dir)) + 1  # NOTE: paths are inside tmp_dir
+    plain_text_files = {}
+    plain_texts = []
+    for path, text in zip(paths, texts):
         if text is not None:
             original_stats = path.stat()
             original_meta = MetaDict(
                 filename=path.name,
-                path=str(path.relative_to(tmp_dir)),
+                path=str(path)[tmp_prefix_length:],
                 size=original_stats.st_size,
                 created=original_stats.st_ctime,
                 modified=original_stats.st_mtime,
             )
             plain_text_path = path.with_suffix(".txt")
             plain_text_files[plain_text_path] = original_meta
-            async with aiofiles.open(
-                plain_text_path, "w", encoding="utf-8", errors="replace"
-            ) as f:
-                await f.write(text)
-            await run_in_threadpool(path.unlink)
+            plain_texts.append((path, plain_text_path, text))
+
+    # write all plain text files in a single threadpool call
+    plain_text_sizes = await run_in_threadpool(write_plain_text_files, plain_texts)
+    for meta, plain_text_size in zip(plain_text_files.values(), plain_text_sizes):
+        meta["plain_text_size"] = plain_text_size
     return plain_text_files
 
 
-async def file_to_plain_text(path: Path) -> Optional[str]:
+def write_plain_text_files(plain_texts: list[tuple[Path, Path, str]]) -> list[int]:
+    """
+    Writes plain text files and deletes the original files they were converted from.
+
+    Args:
+        plain_texts (list[tuple[Path, Path, str]]): Tuples of (original path, plain text path, text).
+
+    Returns:
+        list[int]: Number of bytes written per plain text file.
+    """
+    plain_text_sizes = []
+    for original_path, plain_text_path, text in plain_texts:
+        data = text.encode("utf-8", errors="replace")
+        with open(plain_text_path, "wb") as f:
+            f.write(data)
+        plain_text_sizes.append(len(data))
+        if original_path != plain_text_path:
+            original_path.unlink()
+    return plain_text_sizes
+
+
+def iter_supported_files(paths: list[Path], root: Path) -> Iterator[Path]:
+    """
+    Yields the paths below a directory of files that can be converted to plain text.
+
+    Args:
+        paths (list[Path]): Paths of (extracted) files.
+        root (Path): Directory the files should be in.
+    """
+    for path in paths:
+        if path.suffix.lower() in PLAIN_TEXT_CONVERTERS and path.is_relative_to(root):
+            yield path
+
+
+def file_to_plain_text(path: Path) -> Optional[str]:
     """
     Converts a file to plain text if supported. Returns None if not supported or conversion fails.
+    Runs synchronously, so it can be dispatched to a worker process.
 
     Supported types: .txt, .docx, .pdf, .csv, .rtf, .html
     """
-    ext = path.suffix.lower()
+    converter = PLAIN_TEXT_CONVERTERS.get(path.suffix.lower())
+    if converter is None:
+        # unsupported type
+        return None
+    reader, parser = converter
     try:
-        if ext == ".txt":
-            async with aiofiles.open(
-                path, "r", encoding="utf-8", errors="replace"
-            ) as f:
-                return await f.read()
-        elif ext == ".docx":
-            return await run_in_threadpool(read_docx, path)
-        elif ext == ".pdf":
-            return await run_in_threadpool(read_pdf, path)
-        elif ext == ".csv":
-            async with aiofiles.open(
-                path, "r", encoding="utf-8", errors="replace"
-            ) as f:
-                content = await f.read()
-            return await run_in_threadpool(parse_csv, content)
-        elif ext in [".htm", ".html"]:
-            async with aiofiles.open(
-                path, "r", encoding="utf-8", errors="replace"
-            ) as f:
-                html = await f.read()
-            return await run_in_threadpool(parse_html, html)
-        elif ext == ".rtf":
-            async with aiofiles.open(
-                path, "r", encoding="utf-8", errors="replace"
-            ) as f:
-                rtf = await f.read()
-            return await run_in_threadpool(rtf_to_text, rtf)
-        else:
-            # unsupported type
-            return None
+        content = reader(path)
+        return parser(content) if parser else content
     except Exception as e:
         logger.error(f"Error converting file {path}: {e}")
         return None
 
 
+def read_text(p):
+    with open(p, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def read_text_files(paths: list[Path], max_bytes: int = -1) -> list[str]:
+    """
+    Reads multiple plain text files. Runs synchronously, so a whole batch costs a single threadpool hop.
+
+    Args:
+        paths (list[Path]): Paths of the files to read.
+        max_bytes (int): Maximum number of bytes read (and decoded) per file, -1 reads whole files.
+
+    Returns:
+        list[str]: The file contents.
+    """
+    texts = []
+    for path in paths:
+        with open(path, "rb") as f:
+            texts.append(f.read(max_bytes).decode("utf-8", errors="replace"))
+    return texts
+
+
 def read_docx(p):
-    doc = DocxDocument(str(p))
-    return "\n".join([para.text for para in doc.paragraphs])
+    # stream the document XML instead of building the full python-docx object model
+    paragraphs = []
+    runs = []
+    with zipfile.ZipFile(p) as docx, docx.open("word/document.xml") as xml:
+        for _, elem in ElementTree.iterparse(xml):
+            if elem.tag == DOCX_TEXT_TAG:
+                runs.append(elem.text or "")
+            elif elem.tag == DOCX_TAB_TAG:
+                runs.append("\t")
+            elif elem.tag in DOCX_BREAK_TAGS:
+                runs.append("\n")
+            elif elem.tag == DOCX_PARAGRAPH_TAG:
+                paragraphs.append("".join(runs))
+                runs = []
+                elem.clear()
+    return "\n".join(paragraphs)
 
 
 def read_pdf(p):
-    text = ""
-    with open(p, "rb") as f:
-        reader = pypdf.PdfReader(f)
-        for page in reader.pages:
-            text += page.extract_text() or ""
-    return text
+    with pymupdf.open(str(p)) as doc:
+        return "\n".join(page.get_text("text") for page in doc)
 
 
 def parse_csv(data):
-    lines = []
-    for row in csv.reader(data.splitlines()):
-        lines.append(",".join(row))
-    return "\n".join(lines)
+    # without quoting, re-joining the parsed rows reproduces the input (with \n line endings, minus the final one)
+    if '"' not in data:
+        data = data.replace("\r\n", "\n")
+        if "\r" not in data:
+            return data.removesuffix("\n")
+    return "\n".join(",".join(row) for row in csv.reader(io.StringIO(data)))
 
 
 def parse_html(data):
-    soup = BeautifulSoup(data, "html.parser")
-    return soup.get_text()
+    tree = LexborHTMLParser(data)
+    tree.strip_tags(["script", "style"])
+    return tree.text()
+
+
+# Plain text converters per file extension: (reader, optional parser of the read content)
+PLAIN_TEXT_CONVERTERS: dict[str, tuple[Callable, Optional[Callable]]] = {
+    ".txt": (read_text, None),
+    ".docx": (read_docx, None),
+    ".pdf": (read_pdf, None),
+    ".csv": (read_text, parse_csv),
+    ".htm": (read_text, parse_html),
+    ".html": (read_text, parse_html),
+    ".rtf": (read_text, rtf_to_text),
+}
 
 
 async def add_folder_to_database(
@@ -274,7 +466,8 @@ async def add_folder_to_database(
     db: AsyncSession,
     user_id: int,
     drill: bool,
-    original_file_map: dict[Path, MetaDict],
+    original_file_map: dict[str, MetaDict],
+    dropbox_path_map: dict[str, str],
     parent_folder: Optional[Folder] = None,
 ) -> Folder:
     """
@@ -285,50 +478,56 @@ async def add_folder_to_database(
         tmp_dir (Path): Base temp directory.
         db (AsyncSession): Database session.
         drill (bool): Whether to recursively add subfolders.
-        file_paths (list[Path]): List to collect file paths for upload.
+        original_file_map (dict[str, MetaDict]): Original file meta per (plain text) file path string.
+        dropbox_path_map (dict[str, str]): Dropbox path per (plain text) file path string.
         parent_folder (Optional[Folder]): Parent folder ORM instance.
 
     Returns:
         Folder: The Folder ORM instance added to the database.
     """
     folder = Folder(
-        path=str(current_dir.relative_to(tmp_dir)),
+        path=str(current_dir)[len(str(tmp_dir)) + 1 :],
         name=current_dir.name,
         parent_id=parent_folder.id if parent_folder else None,
         user_id=user_id,
     )
     db.add(folder)
     await db.flush()
-    number_of_documents = 0
-    for file in os.listdir(current_dir):
-        file_path = Path(current_dir) / file
-        if file_path.is_file():
-            number_of_documents += 1
-            original_meta = original_file_map[file_path]
-            document = Document(
-                folder=folder,
-                **original_meta,
-                dropbox_path=None,  # NOTE: to be updated after upload
-                plain_text_size=file_path.stat().st_size,
-                user_id=user_id,
-            )
-            db.add(document)
+    document_rows = []
+    subfolder_paths = []
+    with os.scandir(current_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                original_meta = original_file_map[entry.path]
+                document_rows.append(
+                    dict(
+                        folder_id=folder.id,
+                        **original_meta,
+                        dropbox_path=dropbox_path_map.get(entry.path),
+                        user_id=user_id,
+                    )
+                )
+            elif drill and entry.is_dir():
+                subfolder_paths.append(Path(entry.path))
+
+    # Insert all documents of this folder in one statement
+    number_of_documents = len(document_rows)
+    if document_rows:
+        await db.execute(insert(Document), document_rows)
 
     # Add subfolders recursively
-    if drill:
-        for subfolder_name in os.listdir(current_dir):
-            subfolder_path = Path(current_dir) / subfolder_name
-            if subfolder_path.is_dir():
-                subfolder = await add_folder_to_database(
-                    current_dir=subfolder_path,
-                    tmp_dir=tmp_dir,
-                    db=db,
-                    user_id=user_id,
-                    drill=drill,
-                    original_file_map=original_file_map,
-                    parent_folder=folder,
-                )
-                number_of_documents += subfolder.number_of_documents
+    for subfolder_path in subfolder_paths:
+        subfolder = await add_folder_to_database(
+            current_dir=subfolder_path,
+            tmp_dir=tmp_dir,
+            db=db,
+            user_id=user_id,
+            drill=drill,
+            original_file_map=original_file_map,
+            dropbox_path_map=dropbox_path_map,
+            parent_folder=folder,
+        )
+        number_of_documents += subfolder.number_of_documents
 
     # Update number_of_documents
     folder.number_of_documents = number_of_documents
@@ -341,82 +540,103 @@ async def add_folder_to_database(
 
 
 async def upload_files_to_dropbox(
-    dropbox_client: Dropbox, file_paths: list[Path], tmp_dir: Path
-) -> tuple[dict, files.UploadSessionFinishBatchResult]:
+    dropbox_client: Dropbox,
+    file_paths: list[Path],
+    tmp_dir: Path,
+    file_sizes: dict[Path, int],
+) -> dict[Path, str]:
     """
-    Uploads multiple files to Dropbox using upload sessions, chunking each file and finishing all sessions in a batch.
+    Uploads multiple files to Dropbox. Files below the single upload limit are uploaded in one call each;
+    larger files are chunked into upload sessions, which are finished in a batch.
 
     Args:
         request (Request): FastAPI request object.
         file_paths (list[Path]): List of file paths to upload.
         tmp_dir (Path): Base temp directory.
+        file_sizes (dict[Path, int]): Size (in bytes) per file path, as recorded when the files were written.
 
     Returns:
-        tuple[dict, files.UploadSessionFinishBatchResult]:
-            - dict mapping relative file paths to Dropbox paths
-            - Dropbox batch result object
+        dict[Path, str]: Mapping of relative file paths to Dropbox paths.
     """
+    finish_batch_result = None
     try:
+        # Generate unique Dropbox paths
         dropbox_paths = {}
-        entries: list[files.UploadSessionFinishArg] = []
-        batch_start_result = await run_in_threadpool(
-            dropbox_client.files_upload_session_start_batch,
-            len(file_paths),
-            files.UploadSessionType.sequential,
-        )
-
-        # get session ids
-        if len(batch_start_result.session_ids) != len(file_paths):
-            raise HTTPException(
-                status_code=500,
-                detail="Dropbox did not return session IDs for all files",
+        for file_path in file_paths:
+            file_id = str(uuid.uuid4())
+            _, file_ext = os.path.splitext(file_path.name)
+            dropbox_filename = f"{file_id}{file_ext}"
+            dropbox_paths[file_path.relative_to(tmp_dir)] = (
+                f"{settings.UPLOAD_DIR}/{dropbox_filename}"
             )
 
-        # Loop over files and upload each one in chunks
-        for file_path, session_id in zip(file_paths, batch_start_result.session_ids):
-            # Relative filepath
-            relative_path = file_path.relative_to(tmp_dir)
+        # Split files by size
+        small_files, large_files = [], []
+        for file_path in file_paths:
+            if file_sizes[file_path] < settings.DROPBOX_SINGLE_UPLOAD_LIMIT:
+                small_files.append(file_path)
+            else:
+                large_files.append(file_path)
 
-            # Generate unique file ID and path
-            file_id = str(uuid.uuid4())
-            file_ext = (
-                "." + file_path.name.split(".")[-1] if "." in file_path.name else ""
-            )
-            dropbox_filename = f"{file_id}{file_ext}"
-            dropbox_path = f"{settings.UPLOAD_DIR}/{dropbox_filename}"
+        # Upload files concurrently (bounded)
+        semaphore = asyncio.Semaphore(settings.DROPBOX_UPLOAD_CONCURRENCY)
 
-            # Append the rest of the chunks using aiofiles for async file I/O
+        async def upload_small_file(file_path: Path):
+            dropbox_path = dropbox_paths[file_path.relative_to(tmp_dir)]
+            async with semaphore:
+                await run_in_threadpool(
+                    upload_file, dropbox_client, file_path, dropbox_path
+                )
+
+        async def upload_large_file(file_path: Path, session_id: str):
+            dropbox_path = dropbox_paths[file_path.relative_to(tmp_dir)]
+
+            # Stream the file contents into the session (closing it with the last chunk)
             cursor = files.UploadSessionCursor(session_id=session_id, offset=0)
-            async with aiofiles.open(file_path, "rb") as file:
-                content = await file.read()
+            async with semaphore:
                 await run_in_threadpool(
-                    dropbox_client.files_upload_session_append_v2,
-                    content,
+                    append_file_to_upload_session,
+                    dropbox_client,
+                    file_path,
+                    file_sizes[file_path],
                     cursor,
                 )
-                cursor.offset += len(content)
-            await run_in_threadpool(
-                dropbox_client.files_upload_session_append_v2,
-                b"",
-                cursor,
-                close=True,
-            )
 
-            # Save entry for batch finish
+            # Entry for batch finish
             commit = files.CommitInfo(path=dropbox_path)
-            finish_arg = files.UploadSessionFinishArg(cursor=cursor, commit=commit)
-            entries.append(finish_arg)
+            return files.UploadSessionFinishArg(cursor=cursor, commit=commit)
+
+        session_ids = []
+        if large_files:
+            batch_start_result = await run_in_threadpool(
+                dropbox_client.files_upload_session_start_batch,
+                len(large_files),
+                files.UploadSessionType.sequential,
+            )
+            session_ids = batch_start_result.session_ids
+
+            # get session ids
+            if len(session_ids) != len(large_files):
+                raise HTTPException(
+                    status_code=500,
+                    detail="Dropbox did not return session IDs for all files",
+                )
 
-            # Save metadata for response
-            dropbox_paths[relative_path] = dropbox_path
+        _, entries = await asyncio.gather(
+            asyncio.gather(*(upload_small_file(p) for p in small_files)),
+            asyncio.gather(
+                *(upload_large_file(p, s) for p, s in zip(large_files, session_ids))
+            ),
+        )
 
         # Finish all sessions in one batch
-        finish_batch_result: files.UploadSessionFinishBatchResult = (
-            await run_in_threadpool(
-                dropbox_client.files_upload_session_finish_batch_v2,
-                entries,
+        if entries:
+            finish_batch_result: files.UploadSessionFinishBatchResult = (
+                await run_in_threadpool(
+                    dropbox_client.files_upload_session_finish_batch_v2,
+                    entries,
+                )
             )
-        )
 
     except Exception as e:
         logger.error(f"Error uploading file(s) to Dropbox: {e}")
@@ -426,10 +646,11 @@ async def upload_files_to_dropbox(
 
     # check for any failed uploads
     failures = []
-    for entry in finish_batch_result.entries:
-        if entry.is_failure():
-            logger.error(f"Failed to upload file to Dropbox: {entry}")
-            failures.append(entry)
+    if finish_batch_result:
+        for entry in finish_batch_result.entries:
+            if entry.is_failure():
+                logger.error(f"Failed to upload file to Dropbox: {entry}")
+                failures.append(entry)
     if failures:
         raise HTTPException(
             status_code=500, detail="Failed to upload one or more files to Dropbox"
@@ -438,53 +659,65 @@ async def upload_files_to_dropbox(
     return dropbox_paths
 
 
-async def get_folder_by_path(
-    path: str, db: AsyncSession, user: User
-) -> Optional[Folder]:
+def upload_file(dropbox_client: Dropbox, file_path: Path, dropbox_path: str):
     """
-    Retrieves a Folder ORM instance by its path from the database.
+    Uploads a file to Dropbox in a single call (files up to the single upload limit).
 
     Args:
-        path (str): Relative path of the folder.
-        db (AsyncSession): Database session.
+        dropbox_client (Dropbox): Authenticated Dropbox client.
+        file_path (Path): Path of the file to upload.
+        dropbox_path (str): Destination path in Dropbox.
+    """
+    with open(file_path, "rb") as f:
+        dropbox_client.files_upload(f.read(), dropbox_path)
 
-    Returns:
-        Optional[Folder]: The Folder ORM instance, or None if not found.
+
+def append_file_to_upload_session(
+    dropbox_client: Dropbox,
+    file_path: Path,
+    file_size: int,
+    cursor: files.UploadSessionCursor,
+):
     """
-    segments = Path(path).parts
-    return await get_folder_by_segments(segments, db, user)
+    Appends a file to a Dropbox upload session in fixed-size chunks, so memory use stays bounded.
+    The session is closed with the last chunk and the cursor offset is advanced in place.
+    The next chunk is read from disk while the current one is being sent (at most two chunks in memory).
 
+    Args:
+        dropbox_client (Dropbox): Authenticated Dropbox client.
+        file_path (Path): Path of the file to upload.
+        file_size (int): Size of the file (in bytes).
+        cursor (files.UploadSessionCursor): Cursor of the upload session.
+    """
+    chunk_size = settings.DROPBOX_UPLOAD_CHUNK_SIZE
+    with open(file_path, "rb") as f, ThreadPoolExecutor(max_workers=1) as reader:
+        next_chunk = reader.submit(f.read, chunk_size)
+        while True:
+            chunk = next_chunk.result()
+            close = cursor.offset + len(chunk) >= file_size
+            if not close:
+                next_chunk = reader.submit(f.read, chunk_size)
+            dropbox_client.files_upload_session_append_v2(chunk, cursor, close=close)
+            cursor.offset += len(chunk)
+            if close:
+                break
 
-async def get_document_by_path(
+
+async def get_folder_by_path(
     path: str, db: AsyncSession, user: User
-) -> Optional[Document]:
+) -> Optional[Folder]:
     """
-    Retrieves a Document ORM instance by its path from the database.
+    Retrieves a Folder ORM instance by its path from the database.
 
     Args:
-        path (str): Relative path of the document.
+        path (str): Relative path of the folder.
         db (AsyncSession): Database session.
 
     Returns:
-        Optional[Document]: The Document ORM instance, or None if not found.
+        Optional[Folder]: The Folder ORM instance, or None if not found.
     """
     segments = Path(path).parts
-    if len(segments) < 2:
-        raise HTTPException(status_code=400, detail="Invalid document path")
-
-    # get parent folder of document
-    *folder_segments, filename = segments
-    folder = await get_folder_by_segments(folder_segments, db, user)
-    if not folder:
-        raise HTTPException(status_code=404, detail="Document folder not found")
-
-    # get document by filename and folder_id
-    result = await db.execute(
-        select(Document).where(
-            Document.folder_id == folder.id, Document.filename == filename
-        )
-    )
-    return result.scalars().first()
+    return await get_folder_by_segments(segments, db, user)
 
 
 async def get_folder_by_segments(
@@ -492,6 +725,7 @@ async def get_folder_by_segments(
 ) -> Optional[Folder]:
     """
     Retrieves a Folder ORM instance by its path segments from the database.
+    The folder is looked up by its (unique, indexed) path in a single query.
 
     Args:
         segments (list[str]): List of path segments representing the folder hierarchy.
@@ -500,22 +734,15 @@ async def get_folder_by_segments(
     Returns:
         Optional[Folder]: The Folder ORM instance, or None if not found.
     """
-    parent_id = None
-    folder = None
-    for segment in segments:
-        # only search parent folder
-        query = select(Folder).where(
-            Folder.parent_id == parent_id, Folder.user_id == user.id
-        )
+    if not segments:
+        return None
 
-        # search for the folder by name
-        query = query.where(Folder.name == segment)
-        result = await db.execute(query)
-        folder = result.scalars().first()
-        if not folder:
-            return None
-        parent_id = folder.id
-    return folder
+    result = await db.execute(
+        select(Folder).where(
+            Folder.path == str(Path(*segments)), Folder.user_id == user.id
+        )
+    )
+    return result.scalars().first()
 
 
 async def get_documents_in_folder(
@@ -523,63 +750,85 @@ async def get_documents_in_folder(
 ) -> list[Document]:
     """
     Retrieves all Document ORM instances in a given folder.
+    With drill, documents in all subfolders are fetched as well, using a single recursive CTE query.
 
     Args:
         folder (Folder): The Folder ORM instance.
         db (AsyncSession): Database session.
+        drill (bool): Whether to include documents in subfolders (recursively).
+        classified (bool): Whether to retrieve classified (with their classifications loaded) or unclassified documents.
 
     Returns:
         list[Document]: List of Document ORM instances in the folder.
     """
-    documents = []
+    if drill:
+        in_folder = Document.folder_id.in_(select_folder_tree_ids(folder))
+    else:
+        in_folder = Document.folder_id == folder.id
+
     query = select(Document).where(
-        Document.folder_id == folder.id,
+        in_folder,
         (
             Document.classification != None
             if classified
             else Document.classification == None
         ),
     )
-    if drill:
-        # Get documents in the current folder
-        result = await db.execute(query)
-
-        # Recursively get documents in subfolders
-        subfolders = await get_subfolders_in_folder(folder, db)
-        for subfolder in subfolders:
-            documents.extend(
-                await get_documents_in_folder(
-                    subfolder, db, drill=True, classified=classified
-                )
-            )
-    else:
-        result = await db.execute(query)
-
-    documents.extend(result.scalars().all())
-
-    return documents
+    if classified:
+        # load the classifications in the same statement
+        query = query.options(joinedload(Document.classification))
+    result = await db.execute(query)
+    return list(result.unique().scalars().all())
 
 
-async def get_subfolders_in_folder(folder: Folder, db: AsyncSession) -> list[Folder]:
+async def get_subfolders_in_folder(
+    folder: Folder, db: AsyncSession, drill: bool = False
+) -> list[Folder]:
     """
     Retrieves all subfolder ORM instances for a given folder.
+    With drill, all descendant folders are fetched as well, using a single recursive CTE query.
 
     Args:
         folder (Folder): The Folder ORM instance.
         db (AsyncSession): Database session.
+        drill (bool): Whether to include subfolders of subfolders (recursively).
 
     Returns:
         list[Folder]: List of subfolder ORM instances.
     """
-    result = await db.execute(select(Folder).where(Folder.parent_id == folder.id))
-    return result.scalars().all()
+    if drill:
+        query = select(Folder).where(
+            Folder.id.in_(select_folder_tree_ids(folder)), Folder.id != folder.id
+        )
+    else:
+        query = select(Folder).where(Folder.parent_id == folder.id)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+def select_folder_tree_ids(folder: Folder) -> Select:
+    """
+    Builds a (recursive CTE) query selecting the ids of a folder and all of its descendants.
+
+    Args:
+        folder (Folder): The Folder ORM instance at the root of the tree.
+
+    Returns:
+        Select: Query selecting the folder ids.
+    """
+    tree = select(Folder.id).where(Folder.id == folder.id).cte("tree", recursive=True)
+    subfolder = aliased(Folder)
+    tree = tree.union_all(
+        select(subfolder.id).join(tree, subfolder.parent_id == tree.c.id)
+    )
+    return select(tree.c.id)
 
 
 async def download_files_from_dropbox(
     dropbox_client: Dropbox, dropbox_paths: list[str], tmp_dir: Path
 ) -> list[Path]:
     """
-    Downloads multiple files from Dropbox and returns their contents as a list of strings.
+    Downloads multiple files from Dropbox concurrently (bounded) into a temporary directory.
 
     Args:
         dropbox_client (Dropbox): Authenticated Dropbox client.
@@ -587,14 +836,16 @@ async def download_files_from_dropbox(
         tmp_dir (Path): Temporary directory to save downloaded files.
 
     Returns:
-        list[str]: List of file contents as strings.
-    """
-    download_paths = []
-    for dropbox_path in dropbox_paths:
-        download_path = str(tmp_dir / Path(dropbox_path).name)
-        download_paths.append(download_path)
-        await run_in_threadpool(
-            dropbox_client.files_download_to_file, download_path, dropbox_path
-        )
+        list[Path]: Local paths of the downloaded files, in the order of dropbox_paths.
+    """
+    semaphore = asyncio.Semaphore(settings.DROPBOX_DOWNLOAD_CONCURRENCY)
+
+    async def download_file(dropbox_path: str) -> Path:
+        download_path = tmp_dir / Path(dropbox_path).name
+        async with semaphore:
+            await run_in_threadpool(
+                dropbox_client.files_download_to_file, str(download_path), dropbox_path
+            )
+        return download_path
 
-    return download_paths
+    return list(await asyncio.gather(*(download_file(p) for p in dropbox_paths)))
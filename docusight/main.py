@@ -7,6 +7,7 @@ from docusight.classifier_pipeline import setup_pipeline
 from docusight.config import settings
 from docusight.database import create_tables, drop_tables
 from docusight.dropbox import cleanup_dropbox_files
+from docusight.file_utils import shutdown_process_pool
 from docusight.models import *  # ensures all models are declared before creating tables
 from docusight.routers.authentication import router as authentication_router
 from docusight.routers.classification import router as classification_router
@@ -41,6 +42,12 @@ async def lifespan(app: FastAPI):
     # Drop ORM tables (except users to keep accounts)
     await drop_tables(users=False, folders=True, documents=True, classifications=True)
 
+    # Stop file parsing worker processes
+    shutdown_process_pool()
+
+    # Stop inference threads
+    app.state.inference_executor.shutdown()
+
 
 # Main application instance
 app = FastAPI(
@@ -31,7 +31,7 @@ class Folder(Base):
     id = Column(Integer, primary_key=True, index=True)
     path = Column(String, unique=True, index=True)
     name = Column(String, index=True)
-    parent_id = Column(Integer, ForeignKey("folders.id"), nullable=True)
+    parent_id = Column(Integer, ForeignKey("folders.id"), nullable=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     number_of_documents = Column(Integer, default=0)
 
@@ -48,12 +48,12 @@ class Document(Base):
     __tablename__ = "documents"
 
     id = Column(Integer, primary_key=True, index=True)
-    folder_id = Column(Integer, ForeignKey("folders.id"))
+    folder_id = Column(Integer, ForeignKey("folders.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     # original file meta
     filename = Column(String, index=True)
-    path = Column(String)
+    path = Column(String, index=True)
     size = Column(Integer)
     created = Column(Float)
     modified = Column(Float)
@@ -72,7 +72,7 @@ class Classification(Base):
     __tablename__ = "classifications"
 
     id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(Integer, ForeignKey("documents.id"))
+    document_id = Column(Integer, ForeignKey("documents.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     label = Column(String)
     score = Column(String)
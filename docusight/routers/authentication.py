@@ -1,16 +1,20 @@
-import urllib.parse
 from datetime import datetime
 from typing import Optional
 
 from dropbox import Dropbox
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from docusight.config import settings
 from docusight.database import get_db
-from docusight.dropbox import get_auth_flow
+from docusight.dropbox import (
+    cache_dropbox_client,
+    create_dropbox_client,
+    get_auth_flow,
+)
 from docusight.models import User
 
 # NOTE: do not change this prefix as it is used in OAuth redirect URIs
@@ -46,8 +50,6 @@ async def dropbox_auth(request: Request):
     Returns:
         DropboxAuthURLResponseModel: Contains the Dropbox authorization URL for user login. Go to this URL to authenticate.
     """
-    from fastapi.concurrency import run_in_threadpool
-
     auth_flow = get_auth_flow(request.base_url, request.session)
     authorize_url = await run_in_threadpool(auth_flow.start)
     return DropboxAuthURLResponseModel(auth_url=authorize_url)
@@ -75,34 +77,34 @@ async def dropbox_callback(
     Returns:
         DropboxAuthCallbackResponseModel: Contains user info and Dropbox tokens.
     """
-    from fastapi.concurrency import run_in_threadpool
-
     try:
         auth_flow = get_auth_flow(request.base_url, request.session)
 
-        # Decode incoming OAuth parameters
-        code_decoded = urllib.parse.unquote(code)
-        state_decoded = urllib.parse.unquote(state)
-
         # Finish OAuth flow (blocking)
+        # NOTE: query parameters are already URL-decoded by Starlette
         oauth_result = await run_in_threadpool(
             auth_flow.finish,
-            {"code": code_decoded, "state": state_decoded, "error": error},
+            {"code": code, "state": state, "error": error},
         )
 
         # Get dropbox tokens
         access_token = oauth_result.access_token
         refresh_token = oauth_result.refresh_token
+        expires_at = oauth_result.expires_at if oauth_result.expires_at else None
 
         # Create Dropbox client using access token
-        dropbox_client = Dropbox(access_token)
+        dropbox_client: Dropbox = create_dropbox_client(
+            access_token, refresh_token, expires_at
+        )
 
         # Get user account info
         user_info = await run_in_threadpool(dropbox_client.users_get_current_account)
         display_name = user_info.name.display_name
         email = user_info.email
         account_id = user_info.account_id
-        expires_at = oauth_result.expires_at if oauth_result.expires_at else None
+
+        # Cache the (validated) client for subsequent requests of this user
+        cache_dropbox_client(account_id, dropbox_client, access_token, expires_at)
 
         # Store account ID in session
         request.session[settings.DROPBOX_ACCOUNT_ID_SESSION_KEY] = account_id
@@ -1,13 +1,15 @@
+import asyncio
 import os
+import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import aiofiles
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from transformers import Pipeline
 
 from docusight.config import settings
@@ -18,16 +20,41 @@ from docusight.file_utils import (
     generate_tmp_dir,
     get_documents_in_folder,
     get_folder_by_path,
+    read_text_files,
 )
 from docusight.logging import logger
-from docusight.models import Classification, Folder
-from docusight.routers.insight import DocumentResponseModel, generate_document_response
+from docusight.models import Classification, Document, Folder, User
+from docusight.routers.insight import (
+    DocumentResponseModel,
+    generate_document_response,
+    generate_json_response,
+)
 
 router = APIRouter(
     prefix="/classification",
     tags=["Classification"],
 )
 
+# Model labels normalized to "Positive", "Negative" or "Neutral"
+SENTIMENT_LABELS = {
+    "very negative": "Negative",
+    "negative": "Negative",
+    "neutral": "Neutral",
+    "positive": "Positive",
+    "very positive": "Positive",
+}
+
+# Star ratings (e.g. "4 stars") normalized by number of stars (indexed up to 5 stars)
+STARS_LABEL_PATTERN = re.compile(r"(\d+) stars?")
+STARS_SENTIMENTS = (
+    "Negative",
+    "Negative",
+    "Negative",
+    "Neutral",
+    "Positive",
+    "Positive",
+)
+
 
 # Response models
 class DocumentClassificationResponseModel(BaseModel):
@@ -85,81 +112,45 @@ async def classify_folder(
                 status_code=400, detail="No documents in folder to classify"
             )
 
-        # download unclassified documents from dropbox
-        dropbox_client = await get_dropbox_client(user)
-        dropbox_paths = [
-            doc.dropbox_path for doc in unclassified_documents if doc.dropbox_path
-        ]
-        os.makedirs(tmp_dir, exist_ok=True)
-        local_paths: list[Path] = await download_files_from_dropbox(
-            dropbox_client, dropbox_paths, tmp_dir
-        )
-
-        # classify each document
-        classifier: Pipeline = request.app.state.sentiment_classifier
+        # classify unclassified documents (skipped when everything is classified already)
         classifications = []
-        batch_size = settings.CLASSIFICATION_BATCH_SIZE
-        for i in range(0, len(local_paths), batch_size):
-            # read batch of files
-            batch_paths = local_paths[i : i + batch_size]
-            batch_texts = []
-            for doc_path in batch_paths:
-                async with aiofiles.open(
-                    doc_path, "r", encoding="utf-8", errors="replace"
-                ) as f:
-                    text = await f.read()
-                    batch_texts.append(text)
-
-            # classify batch
-            batch_results = await classify_batch(classifier, batch_texts)
-
-            # map results back to documents
-            batch_docs = unclassified_documents[i : i + batch_size]
-            for doc, res in zip(batch_docs, batch_results):
-                label = res["label"]
-                score = res["score"]
-
-                # Save to DB
-                classification = Classification(
-                    user_id=user.id, document=doc, label=label, score=score
-                )
-                db.add(classification)
-
-                # store classification for response
-                classifications.append(classification)
-
-        # Remove temporary directory
-        await run_in_threadpool(shutil.rmtree, tmp_dir)
+        documents = [doc for doc in unclassified_documents if doc.dropbox_path]
+        if documents:
+            classifications = await classify_documents(
+                request, db, user, documents, tmp_dir
+            )
 
-        # Commit the transaction and refresh the folder instance
-        await db.commit()
-        for classification in classifications:
-            await db.refresh(classification)
+            # Commit the transaction (NOTE: no refresh needed, sessions do not expire on commit)
+            await db.commit()
 
         # Add already classified documents to response
-        result = await db.execute(
-            select(Classification).where(
-                Classification.document_id.in_([doc.id for doc in classified_documents])
-            )
-        )
-        classifications.extend(result.scalars().all())
+        for doc in classified_documents:
+            classifications.extend(doc.classification)
 
-        # Prepare responses
+        # Prepare responses (documents are looked up by the classification's document ID)
+        documents_by_id = {
+            doc.id: doc for doc in [*unclassified_documents, *classified_documents]
+        }
         classification_responses = []
         for classification in classifications:
-            classification_response = DocumentClassificationResponseModel(
-                id=classification.id,
-                document_id=classification.document_id,
-                label=classification.label,
-                score=classification.score,
-                document=generate_document_response(classification.document),
+            document = documents_by_id[classification.document_id]
+            # NOTE: constructed without validation, ORM data is trusted
+            classification_response = (
+                DocumentClassificationResponseModel.model_construct(
+                    id=classification.id,
+                    document_id=classification.document_id,
+                    label=classification.label,
+                    score=float(classification.score),  # NOTE: stored as string
+                    document=generate_document_response(document),
+                )
             )
             classification_responses.append(classification_response)
 
-        return FolderClassificationResponseModel(
+        response = FolderClassificationResponseModel.model_construct(
             folder_path=folder.path,
             classified_documents=classification_responses,
         )
+        return generate_json_response(response)
 
     except Exception as e:
         logger.error(f"Classification failed: {e}")
@@ -168,43 +159,117 @@ async def classify_folder(
         raise HTTPException(status_code=500, detail="Sentiment classification failed")
 
 
-async def classify_batch(classifier: Pipeline, texts: list[str]):
+async def classify_documents(
+    request: Request,
+    db: AsyncSession,
+    user: User,
+    documents: list[Document],
+    tmp_dir: Path,
+) -> list[Classification]:
+    """
+    Downloads documents from Dropbox and classifies them in batches, adding the classifications to the database.
+    The next batch is downloaded while the current one is classified.
+
+    Args:
+        request (Request): FastAPI request object.
+        db (AsyncSession): Database session.
+        user (User): The current user.
+        documents (list[Document]): Documents (with a Dropbox path) to classify.
+        tmp_dir (Path): Temporary directory for downloads (removed afterwards).
+
+    Returns:
+        list[Classification]: The added Classification ORM instances.
+    """
+    # download documents from dropbox in batches
+    dropbox_client = await get_dropbox_client(user)
+    batch_size = settings.CLASSIFICATION_BATCH_SIZE
+    batches = [
+        documents[i : i + batch_size] for i in range(0, len(documents), batch_size)
+    ]
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    def download_batch(batch_docs: list[Document]) -> asyncio.Task:
+        return asyncio.create_task(
+            download_files_from_dropbox(
+                dropbox_client, [doc.dropbox_path for doc in batch_docs], tmp_dir
+            )
+        )
+
+    # classify each batch, while the next batch is being downloaded
+    classifier: Pipeline = request.app.state.sentiment_classifier
+    classification_rows = []
+    next_download = download_batch(batches[0]) if batches else None
+    try:
+        for i, batch_docs in enumerate(batches):
+            batch_paths: list[Path] = await next_download
+            next_download = (
+                download_batch(batches[i + 1]) if i + 1 < len(batches) else None
+            )
+
+            # read batch of files (only the start is classified, longer inputs are truncated)
+            batch_texts = await run_in_threadpool(
+                read_text_files, batch_paths, settings.CLASSIFICATION_MAX_TEXT_BYTES
+            )
+
+            # classify batch
+            batch_results = await classify_batch(
+                classifier, batch_texts, request.app.state.inference_executor
+            )
+
+            # map results back to documents (the pipeline returns one result per input, in order)
+            for doc, res in zip(batch_docs, batch_results, strict=True):
+                classification_rows.append(
+                    dict(
+                        user_id=user.id,
+                        document_id=doc.id,
+                        label=res["label"],
+                        score=res["score"],
+                    )
+                )
+    finally:
+        if next_download:
+            next_download.cancel()
+
+    # Save all classifications to DB in one statement (and keep them for the response)
+    result = await db.execute(
+        insert(Classification).returning(Classification), classification_rows
+    )
+    classifications = list(result.scalars().all())
+
+    # Remove temporary directory
+    await run_in_threadpool(shutil.rmtree, tmp_dir)
+
+    return classifications
+
+
+async def classify_batch(
+    classifier: Pipeline, texts: list[str], executor: ThreadPoolExecutor
+):
     """
     Runs batch sentiment classification using the provided Hugging Face pipeline.
-    Executes in a threadpool for performance.
+    Executes in the dedicated inference threads, apart from the shared threadpool.
 
     Args:
         classifier (Pipeline): Hugging Face sentiment analysis pipeline.
         texts (list[str]): List of document texts to classify.
+        executor (ThreadPoolExecutor): Dedicated inference executor.
 
     Returns:
         list[dict]: List of classification results, each with 'label' and 'score'.
     """
-    # classify in threadpool
-    result = await run_in_threadpool(
-        classifier, texts, batch_size=settings.CLASSIFICATION_BATCH_SIZE
-    )
+    # classify in inference thread
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor, classifier, texts)
 
     # Normalize labels to "Positive", "Negative", "Neutral" (supports various model outputs)
     for res in result:
-        label = res["label"].lower()
-
-        # Handle cases like "4 stars", "very positive", etc.
-        if label.endswith(" stars"):
-            stars = int(label.split(" ")[0])
-            if stars <= 2:
-                res["label"] = "Negative"
-            elif stars == 3:
-                res["label"] = "Neutral"
-            else:
-                res["label"] = "Positive"
-
-        # Handle cases like "very negative", "positive", "neutral", etc.
-        if label in ["very  negative", "negative"]:
-            res["label"] = "Negative"
-        elif label in ["neutral"]:
-            res["label"] = "Neutral"
-        elif label in ["positive", "very  positive"]:
-            res["label"] = "Positive"
+        label = " ".join(res["label"].lower().split())
+
+        # Handle cases like "4 stars", "very positive", "neutral", etc.
+        stars = STARS_LABEL_PATTERN.fullmatch(label)
+        if stars:
+            res["label"] = STARS_SENTIMENTS[min(int(stars.group(1)), 5)]
+        else:
+            res["label"] = SENTIMENT_LABELS.get(label, res["label"])
 
     return result
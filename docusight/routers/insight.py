@@ -1,6 +1,13 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Request, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Request,
+    Response,
+    UploadFile,
+)
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -48,16 +55,20 @@ def generate_document_response(document: Document) -> DocumentResponseModel:
     Returns:
         DocumentResponseModel: The response model for the document.
     """
-    return DocumentResponseModel(
-        id=document.id,
-        path=document.path,
-        folder_id=document.folder_id,
-        filename=document.filename,
-        size=document.size,
-        created=document.created,
-        modified=document.modified,
-        dropbox_path=document.dropbox_path,
-        plain_text_size=document.plain_text_size,
+    # NOTE: loaded columns are read from the instance dict, bypassing the instrumented attributes
+    d = document.__dict__
+
+    # NOTE: constructed without validation, ORM data is trusted
+    return DocumentResponseModel.model_construct(
+        id=d["id"],
+        path=d["path"],
+        folder_id=d["folder_id"],
+        filename=d["filename"],
+        size=d["size"],
+        created=d["created"],
+        modified=d["modified"],
+        dropbox_path=d.get("dropbox_path"),
+        plain_text_size=d.get("plain_text_size"),
     )
 
 
@@ -75,7 +86,8 @@ async def generate_folder_response(
     folder: Folder, db: AsyncSession
 ) -> FolderResponseModel:
     """
-    Recursively generate a FolderResponseModel from a Folder ORM object, including documents and subfolders.
+    Generate a FolderResponseModel from a Folder ORM object, including (nested) documents and subfolders.
+    The whole folder tree is loaded in two queries and assembled in memory in a single pass.
 
     Args:
         folder (Folder): The Folder ORM instance.
@@ -84,25 +96,52 @@ async def generate_folder_response(
     Returns:
         FolderResponseModel: The response model for the folder, including nested documents and subfolders.
     """
-    documents = await get_documents_in_folder(folder, db)
-    subfolders = await get_subfolders_in_folder(folder, db)
-    return FolderResponseModel(
-        id=folder.id,
-        path=folder.path,
-        name=folder.name,
-        parent_id=folder.parent_id,
-        documents=[generate_document_response(doc) for doc in documents],
-        subfolders=[
-            await generate_folder_response(subfolder, db) for subfolder in subfolders
-        ],
-        number_of_documents=folder.number_of_documents,
-    )
+    documents = await get_documents_in_folder(folder, db, drill=True)
+    subfolders = await get_subfolders_in_folder(folder, db, drill=True)
+
+    # build a (flat) response node per folder
+    # NOTE: constructed without validation, ORM data is trusted
+    nodes: dict[int, FolderResponseModel] = {
+        f.id: FolderResponseModel.model_construct(
+            id=f.id,
+            path=f.path,
+            name=f.name,
+            parent_id=f.parent_id,
+            documents=[],
+            subfolders=[],
+            number_of_documents=f.number_of_documents,
+        )
+        for f in [folder, *subfolders]
+    }
+
+    # link documents and subfolders to their parent nodes (iteratively, no recursion)
+    for document in documents:
+        nodes[document.folder_id].documents.append(generate_document_response(document))
+    for subfolder in subfolders:
+        nodes[subfolder.parent_id].subfolders.append(nodes[subfolder.id])
+
+    return nodes[folder.id]
+
+
+def generate_json_response(response: BaseModel) -> Response:
+    """
+    Serialize a response model directly to JSON with pydantic's native serializer.
+    Skips FastAPI's re-validation and jsonable_encoder pass over (large) nested responses.
+
+    Args:
+        response (BaseModel): The response model to serialize.
+
+    Returns:
+        Response: JSON response containing the serialized model.
+    """
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
 @router.post("/folder", response_model=FolderResponseModel)
 async def analyze_folder(
     request: Request,
     zipped_folder: UploadFile,
+    background_tasks: BackgroundTasks,
     drill: bool = True,
     db: AsyncSession = Depends(get_db),
 ):
@@ -116,6 +155,7 @@ async def analyze_folder(
         request (Request): FastAPI request object.
         zipped_folder (UploadFile): The uploaded zipped folder (.zip file).
         drill (bool, optional): Whether to recursively add subfolders. Defaults to True.
+        background_tasks (BackgroundTasks): Tasks run after the response is sent.
         db (AsyncSession): Database session dependency.
 
     Returns:
@@ -131,7 +171,11 @@ async def analyze_folder(
     existing_folder = await get_folder_by_path(str(folder_name), db, user)
     if existing_folder:
         logger.info(f"Folder {folder_name} already already exists in the database.")
-        return await generate_folder_response(existing_folder, db)
+        response = await generate_folder_response(existing_folder, db)
+        return generate_json_response(response)
+
+    # release the connection while the zip is processed and uploaded (NOTE: nothing to commit yet)
+    await db.commit()
 
     # add folder to database (& upload file contents to dropbox)
     dropbox_client = await get_dropbox_client(user)
@@ -141,17 +185,18 @@ async def analyze_folder(
         dropbox_client=dropbox_client,
         user=user,
         drill=drill,
+        background_tasks=background_tasks,
     )
 
     # generate response
     response = await generate_folder_response(folder, db)
     logger.info(f"Added folder {folder_name} to the database.")
 
-    # Commit the transaction and refresh the folder instance
+    # End the (read-only) transaction of the response queries
+    # NOTE: the folder is committed along with its upload, so failed commits clean up the upload too
     await db.commit()
-    await db.refresh(folder)
 
-    return response
+    return generate_json_response(response)
 
 
 # TODO (Nice-to-have): Add endpoint for folder deletion
@@ -4,6 +4,7 @@ import secrets
 import subprocess
 import sys
 import venv
+from functools import lru_cache
 from pathlib import Path
 
 # Get the absolute path of the project directory
@@ -18,9 +19,15 @@ VENV_DIR = ".venv"
 ENV_PATH = APP_DIR / ".env"
 ENV_VARS = {}
 
+# Assignment (KEY=value) lines in the .env file, skipping comments and blank lines
+ENV_LINE_PATTERN = re.compile(r"^[ \t]*([^#\s=][^=\n]*)=(.*?)[ \t\r]*$", re.MULTILINE)
+
 # CUDA versions supported by PyTorch
 CUDA_VERSIONS = ["cu118", "cu126", "cu128"]
 
+# CUDA release (e.g. "release 12.6") in the nvcc version output
+CUDA_RELEASE_PATTERN = re.compile(r"release (\d+)\.(\d+)")
+
 # Python executable within the virtual environment (corrected for linux/windows)
 use_global_python = "--use-global-python" in sys.argv
 
@@ -43,25 +50,6 @@ def create_virtual_environment():
             print(f"Virtual environment '{VENV_DIR}' already exists")
 
 
-def install_package():
-    # upgrade pip
-    subprocess.check_call([PYTHON_EXEC, "-m", "pip", "install", "--upgrade", "pip"])
-    print("✅ Upgraded pip to latest version\n")
-
-    # install local python package
-    subprocess.check_call(
-        [
-            PYTHON_EXEC,
-            "-m",
-            "pip",
-            "install",
-            "-e",
-            PROJECT_DIR,
-        ]
-    )
-    print(f"✅ Installed local package in {PROJECT_DIR}\n")
-
-
 def generate_default_env():
 
     # Parse command-line args
@@ -75,12 +63,7 @@ def generate_default_env():
 
     # Read existing .env if present
     if ENV_PATH.exists():
-        with ENV_PATH.open("r") as f:
-            for line in f:
-                if line.strip() and not line.strip().startswith("#"):
-                    if "=" in line:
-                        k, v = line.strip().split("=", 1)
-                        ENV_VARS[k] = v
+        ENV_VARS.update(ENV_LINE_PATTERN.findall(ENV_PATH.read_text(encoding="utf-8")))
 
     # Set or update required variables
     ENV_VARS["DATABASE_URL"] = ENV_VARS.get(
@@ -99,26 +82,22 @@ def generate_default_env():
     ENV_VARS["SESSION_SECRET_KEY"] = ENV_VARS.get(
         "SESSION_SECRET_KEY", secrets.token_urlsafe(32)
     )
-    ENV_VARS["PYTORCH_CUDA_VERSION"] = ENV_VARS.get("PYTORCH_CUDA_VERSION", None)
     ENV_VARS["CLASSIFICATION_MODEL_NAME"] = ENV_VARS.get(
         "CLASSIFICATION_MODEL_NAME", "DTAI-KULeuven/robbert-v2-dutch-sentiment"
     )
 
 
-def install_torch():
+def install_packages():
     # Find CUDA version
     cuda_version = _get_cuda_version()
 
     # check if the detected CUDA version matches the one in ENV_VARS (if set)
-    if ENV_VARS["PYTORCH_CUDA_VERSION"] is not None:
+    if ENV_VARS.get("PYTORCH_CUDA_VERSION") is not None:
         assert ENV_VARS["PYTORCH_CUDA_VERSION"] == cuda_version, (
             f"Environment variable PYTORCH_CUDA_VERSION={ENV_VARS['PYTORCH_CUDA_VERSION']} "
             f"does not match detected CUDA version {cuda_version}."
         )
 
-    # update env vars with the detected CUDA version if not set
-    ENV_VARS["PYTORCH_CUDA_VERSION"] = cuda_version
-
     # update ENV_VARS with the actual CUDA version used (or if the CPU is used)
     ENV_VARS["PYTORCH_CUDA_VERSION"] = cuda_version
     cuda_used = False
@@ -129,7 +108,25 @@ def install_torch():
     else:
         torch_url = "https://download.pytorch.org/whl/cpu"
 
+    # upgrade pip and install local python package in one pip run
+    subprocess.check_call(
+        [
+            PYTHON_EXEC,
+            "-m",
+            "pip",
+            "install",
+            "--upgrade",
+            "--prefer-binary",
+            "pip",
+            "-e",
+            PROJECT_DIR,
+        ]
+    )
+    print("✅ Upgraded pip to latest version")
+    print(f"✅ Installed local package in {PROJECT_DIR}")
+
     # install PyTorch with or without CUDA support
+    # NOTE: only the PyTorch index is used, so the detected CUDA (or CPU) variant is guaranteed
     subprocess.check_call(
         [
             PYTHON_EXEC,
@@ -146,12 +143,19 @@ def install_torch():
     )
 
 
+@lru_cache(maxsize=1)
 def _get_cuda_version():
+    # skip detection (spawning nvcc) if the CUDA version is set explicitly
+    if os.environ.get("PYTORCH_CUDA_VERSION"):
+        return os.environ["PYTORCH_CUDA_VERSION"]
+
     try:
-        output = subprocess.check_output(["nvcc", "--version"]).decode()
-        for line in output.split("\n"):
+        output = subprocess.run(
+            ["nvcc", "--version"], capture_output=True, text=True, check=True
+        ).stdout
+        for line in output.splitlines():
             if "release" in line:
-                match = re.search(r"release (\d+)\.(\d+)", line)
+                match = CUDA_RELEASE_PATTERN.search(line)
                 if match:
                     major, minor = match.groups()
                     version = f"{major}{minor}"
@@ -167,12 +171,12 @@ def _get_cuda_version():
 
 if __name__ == "__main__":
     create_virtual_environment()
-    install_package()
     generate_default_env()
-    install_torch()
+    install_packages()
 
-    # Write updated .env
-    with ENV_PATH.open("w") as f:
-        for k, v in ENV_VARS.items():
-            f.write(f"{k}={v}\n")
+    # Write updated .env (NOTE: unset values are skipped, not written as 'None')
+    ENV_PATH.write_text(
+        "".join(f"{k}={v}\n" for k, v in ENV_VARS.items() if v is not None),
+        encoding="utf-8",
+    )
     print(f"✅ .env file updated at {ENV_PATH}")
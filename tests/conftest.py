@@ -2,6 +2,7 @@ import os
 import zipfile
 from pathlib import Path
 from shutil import rmtree
+from typing import Iterator
 
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
@@ -9,7 +10,7 @@ from sqlalchemy.future import select
 
 from docusight.classifier_pipeline import setup_pipeline
 from docusight.config import settings
-from docusight.database import create_tables, drop_tables, get_db
+from docusight.database import async_session, create_tables, drop_tables, engine
 from docusight.main import app
 from docusight.models import User
 
@@ -17,6 +18,7 @@ TEMP_MOCK_USER = "Mock User"
 TEMP_DROPBOX_DIR = settings.TEMP_DIR / "mock_dropbox" / "uploads"
 SAMPLE_FOLDER_DIR = settings.DATA_DIR / "sample"
 ZIPPED_FOLDER_PATH = settings.PROJECT_DIR / "tests" / "sample.zip"
+STORED_SUFFIXES = {".pdf", ".docx", ".pptx", ".xlsx", ".zip", ".jpg", ".jpeg", ".png"}
 EXPECTED_SENTIMENTS = {
     "Project 1": "Positive",
     "Project 2": "Positive",
@@ -36,37 +38,44 @@ async def async_client_and_db():
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as ac:
-        # Code run before each test (setup for each test)
-        gen = get_db()
-        db = await gen.__anext__()
-        yield ac, db  # input for each test
-
-        # Code run after each test
-        await db.close()
+        # Code run once, before the first test using this fixture (shared by all tests)
+        async with async_session() as db:
+            yield ac, db  # input for every test (one client and session per run)
 
     # Code run after all tests using this fixture have finished
+    # NOTE: the zipped sample is kept for the next run
+    # NOTE: the mock Dropbox directory lives in TEMP_DIR, so it is removed along with it
     rmtree(settings.TEMP_DIR, ignore_errors=True)
-    rmtree(TEMP_DROPBOX_DIR, ignore_errors=True)
-    delete_zipped_sample()
     await drop_tables()
+    await engine.dispose()
 
 
 def zip_sample_folder():
     if SAMPLE_FOLDER_DIR.exists():
-        with zipfile.ZipFile(ZIPPED_FOLDER_PATH, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(SAMPLE_FOLDER_DIR):
-                # Skip the root directory itself
-                if Path(root) == SAMPLE_FOLDER_DIR:
-                    continue
-                for file in files:
-                    file_path = Path(root) / file
-                    arcname = file_path.relative_to(SAMPLE_FOLDER_DIR.parent)
-                    zipf.write(file_path, arcname)
+        # reuse the zipped sample if it was built before
+        # NOTE: delete tests/sample.zip after changing the sample folder, to rebuild it
+        if ZIPPED_FOLDER_PATH.exists():
+            return
 
-
-def delete_zipped_sample():
-    if ZIPPED_FOLDER_PATH.exists():
-        ZIPPED_FOLDER_PATH.unlink()
+        with zipfile.ZipFile(ZIPPED_FOLDER_PATH, "w", zipfile.ZIP_DEFLATED) as zipf:
+            # NOTE: files directly in the sample folder itself are skipped
+            for file_path in iter_files(SAMPLE_FOLDER_DIR, skip_root_files=True):
+                arcname = file_path.relative_to(SAMPLE_FOLDER_DIR.parent)
+                compress_type = (
+                    zipfile.ZIP_STORED
+                    if file_path.suffix.lower() in STORED_SUFFIXES
+                    else zipfile.ZIP_DEFLATED
+                )
+                zipf.write(file_path, arcname, compress_type=compress_type)
+
+
+def iter_files(directory: Path, skip_root_files: bool = False) -> Iterator[Path]:
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(Path(entry.path))
+            elif not skip_root_files:
+                yield Path(entry.path)
 
 
 async def mock_get_dropbox_client(user):
@@ -75,7 +84,7 @@ async def mock_get_dropbox_client(user):
 
 async def mock_get_user(db, session):
     result = await db.execute(select(User).limit(1))
-    user = result.scalars().first()
+    user = result.scalar_one_or_none()
     if user:
         return user
     raise Exception("No user found in DB for mock_get_user")
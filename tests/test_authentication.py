@@ -75,7 +75,7 @@ class MockUserInfo:
     account_id = "mock_account_id"
 
 
-def mock_dropbox_init(self, access_token):
+def mock_dropbox_init(self, *args, **kwargs):
     pass
 
 
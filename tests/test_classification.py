@@ -1,15 +1,23 @@
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+import torch
 from httpx import AsyncClient
 from pytest import MonkeyPatch
 from sqlalchemy.future import select
 
+from docusight.classifier_pipeline import setup_pipeline
+from docusight.config import settings
 from docusight.models import Document
+from docusight.routers.classification import classify_batch
 from tests.conftest import (
     EXPECTED_SENTIMENTS,
     SAMPLE_FOLDER_DIR,
     TEMP_DROPBOX_DIR,
+    iter_files,
     mock_get_dropbox_client,
     mock_get_user,
 )
@@ -41,26 +49,26 @@ async def test_classification_endpoint(
     data = response.json()
 
     # get all filenames from SAMPLE_FOLDER_DIR
-    project_names = [f.name for f in SAMPLE_FOLDER_DIR.glob("**/*") if f.is_file()]
+    project_names = [path.name for path in iter_files(SAMPLE_FOLDER_DIR)]
 
-    # query database for these documents
-    project_docs = []
-    for project_name in project_names:
-        query = await db.execute(
-            select(Document).where(Document.filename == project_name)
-        )
-        doc = query.scalars().first()
-        if doc:
-            project_docs.append(doc)
+    # query database for these documents (one document per filename)
+    query = await db.execute(
+        select(Document)
+        .where(Document.filename.in_(project_names))
+        .order_by(Document.id)
+    )
+    docs_by_name = {}
+    for doc in query.scalars():
+        docs_by_name.setdefault(doc.filename, doc)
+    project_docs = list(docs_by_name.values())
+    project_doc_ids = {doc.id for doc in project_docs}
 
     classifications = data["classified_documents"]
     num_correct = 0
     for classification in classifications:
         doc_id = classification["document"]["id"]
-        assert any(
-            doc.id == doc_id for doc in project_docs
-        ), f"Document ID {doc_id} not found in DB"
-        document_name = classification["document"]["filename"].split(".")[0]
+        assert doc_id in project_doc_ids, f"Document ID {doc_id} not found in DB"
+        document_name = Path(classification["document"]["filename"]).stem
         if classification["label"] != EXPECTED_SENTIMENTS[document_name]:
             warnings.warn(
                 f"Unexpected label {classification['label']} for {document_name}"
@@ -71,6 +79,56 @@ async def test_classification_endpoint(
     assert average_score >= 0.5, f"Average accuracy below 50%"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "model_label, expected_label",
+    [
+        ("1 star", "Negative"),
+        ("2 stars", "Negative"),
+        ("3 stars", "Neutral"),
+        ("4 stars", "Positive"),
+        ("5 stars", "Positive"),
+        ("7 stars", "Positive"),
+        ("very negative", "Negative"),
+        ("Very  Positive", "Positive"),
+        (" NEUTRAL ", "Neutral"),
+        ("negative", "Negative"),
+        ("positive", "Positive"),
+        ("LABEL_0", "LABEL_0"),
+    ],
+)
+async def test_classify_batch_label_normalization(model_label, expected_label):
+    def mock_classifier(texts):
+        return [{"label": model_label, "score": 0.9} for _ in texts]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = await classify_batch(mock_classifier, ["text"], executor)
+    assert results == [{"label": expected_label, "score": 0.9}]
+
+
+@pytest.mark.asyncio
+async def test_quantized_cpu_pipeline(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(settings, "GPU_DEVICE", -1)
+    monkeypatch.setattr(settings, "CLASSIFICATION_QUANTIZE_CPU", True)
+
+    # build the pipeline on an app of its own, apart from the session's app
+    app = SimpleNamespace(state=SimpleNamespace())
+    setup_pipeline(app)
+    classifier = app.state.sentiment_classifier
+    try:
+        assert any(
+            isinstance(module, torch.ao.nn.quantized.dynamic.Linear)
+            for module in classifier.model.modules()
+        )
+        results = await classify_batch(
+            classifier, ["Dit is een test."], app.state.inference_executor
+        )
+    finally:
+        app.state.inference_executor.shutdown()
+    assert len(results) == 1
+    assert 0.0 <= results[0]["score"] <= 1.0
+
+
 async def mock_download_files_from_dropbox(dropbox_client, dropbox_paths, tmp_dir):
     # Return all files in TEMP_DROPBOX_DIR
     return list(TEMP_DROPBOX_DIR.glob("*"))
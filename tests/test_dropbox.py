@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from pytest import MonkeyPatch
+
+from docusight import dropbox as dropbox_utils
+from docusight.dropbox import cache_dropbox_client, get_dropbox_client
+
+MOCK_ACCOUNT_ID = "mock_account_id"
+MOCK_ACCESS_TOKEN = "mock_access_token"
+MOCK_REFRESHED_ACCESS_TOKEN = "mock_refreshed_access_token"
+
+
+@pytest.fixture
+def mock_user(monkeypatch: MonkeyPatch):
+    # start every test with an empty client cache and no in-flight refreshes
+    monkeypatch.setattr(dropbox_utils, "_dropbox_client_cache", {})
+    monkeypatch.setattr(dropbox_utils, "_token_refresh_tasks", {})
+    monkeypatch.setattr(dropbox_utils, "create_dropbox_client", MockDropbox)
+    return SimpleNamespace(
+        dropbox_account_id=MOCK_ACCOUNT_ID,
+        dropbox_access_token=MOCK_ACCESS_TOKEN,
+        dropbox_refresh_token="mock_refresh_token",
+        dropbox_access_token_expiration=None,
+    )
+
+
+@pytest.fixture
+def mock_token_endpoint(monkeypatch: MonkeyPatch):
+    endpoint = MockTokenEndpoint()
+    monkeypatch.setattr(dropbox_utils, "request_access_token", endpoint)
+    monkeypatch.setattr(dropbox_utils, "save_access_token", endpoint.save)
+    return endpoint
+
+
+@pytest.mark.asyncio
+async def test_stale_token_returns_cached_client(mock_user, mock_token_endpoint):
+    dbx = cache_mock_client(expires_in=timedelta(seconds=60))
+    mock_token_endpoint.release.clear()
+
+    # the cached client is returned while the refresh is still running
+    client = await asyncio.wait_for(get_dropbox_client(mock_user), timeout=5)
+    assert client is dbx
+    refresh_task = dropbox_utils._token_refresh_tasks[MOCK_ACCOUNT_ID]
+    assert not refresh_task.done()
+
+    # the refresh completes in the background, replacing the cached client
+    mock_token_endpoint.release.set()
+    await refresh_task
+    assert mock_token_endpoint.count == 1
+    refreshed_dbx = dropbox_utils._dropbox_client_cache[MOCK_ACCOUNT_ID][0]
+    assert refreshed_dbx.access_token == MOCK_REFRESHED_ACCESS_TOKEN
+
+
+@pytest.mark.asyncio
+async def test_expired_token_waits_for_refresh(mock_user, mock_token_endpoint):
+    cache_mock_client(expires_in=timedelta(seconds=-1))
+
+    client = await get_dropbox_client(mock_user)
+    assert mock_token_endpoint.count == 1
+    assert client.access_token == MOCK_REFRESHED_ACCESS_TOKEN
+    _, _, expiration, _ = dropbox_utils._dropbox_client_cache[MOCK_ACCOUNT_ID]
+    token_state = dropbox_utils.get_token_state(expiration)
+    assert token_state is dropbox_utils.TokenState.FRESH
+
+    # the refreshed token is stored, and requests with the stored token hit the cache
+    assert mock_token_endpoint.saved == {
+        MOCK_ACCOUNT_ID: (MOCK_REFRESHED_ACCESS_TOKEN, expiration)
+    }
+    mock_user.dropbox_access_token = MOCK_REFRESHED_ACCESS_TOKEN
+    mock_user.dropbox_access_token_expiration = expiration
+    assert await get_dropbox_client(mock_user) is client
+    assert not client.validated
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_refresh(mock_user, mock_token_endpoint):
+    cache_mock_client(expires_in=timedelta(seconds=-1))
+    mock_token_endpoint.release.clear()
+
+    callers = asyncio.gather(*(get_dropbox_client(mock_user) for _ in range(5)))
+    await asyncio.sleep(0.1)  # let all callers wait on the refresh
+    mock_token_endpoint.release.set()
+    clients = await asyncio.wait_for(callers, timeout=5)
+
+    assert all(client is clients[0] for client in clients)
+    assert clients[0].access_token == MOCK_REFRESHED_ACCESS_TOKEN
+    assert mock_token_endpoint.count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_rebuilds_client(mock_user, mock_token_endpoint):
+    dbx = cache_mock_client(expires_in=timedelta(seconds=-1))
+    mock_token_endpoint.fail = True
+
+    client = await get_dropbox_client(mock_user)
+    assert mock_token_endpoint.count == 1
+    assert mock_token_endpoint.saved == {}
+    assert client is not dbx
+    assert client.access_token == MOCK_ACCESS_TOKEN
+    assert client.validated
+    assert dropbox_utils._dropbox_client_cache[MOCK_ACCOUNT_ID][0] is client
+
+
+def cache_mock_client(expires_in: timedelta) -> "MockDropbox":
+    # NOTE: expirations are kept as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    dbx = MockDropbox(MOCK_ACCESS_TOKEN, None, now + expires_in)
+    cache_dropbox_client(MOCK_ACCOUNT_ID, dbx, MOCK_ACCESS_TOKEN, dbx.expiration)
+    return dbx
+
+
+class MockTokenEndpoint:
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+        self.count = 0
+        self.saved = {}
+
+    def __call__(self, refresh_token):
+        self.count += 1
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise Exception("mock refresh failure")
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return MOCK_REFRESHED_ACCESS_TOKEN, now + timedelta(hours=4)
+
+    async def save(self, account_id, access_token, expiration):
+        self.saved[account_id] = (access_token, expiration)
+
+
+class MockDropbox:
+    def __init__(self, access_token, refresh_token, expiration):
+        self.access_token = access_token
+        self.expiration = expiration
+        self.validated = False
+
+    def users_get_current_account(self):
+        self.validated = True
@@ -0,0 +1,77 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+from docusight.file_utils import DOCX_NAMESPACE, parse_csv, parse_html, read_docx
+from tests.conftest import SAMPLE_FOLDER_DIR
+
+SAMPLE_DOCX_PATH = SAMPLE_FOLDER_DIR / "Company B" / "Project 2" / "Project 2.docx"
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        # unquoted (fast path)
+        ("a,b\r\nc, d \r\n", "a,b\nc, d "),
+        ("a,b\n\nc,d\n\n", "a,b\n\nc,d\n"),
+        ("a\tb, c", "a\tb, c"),
+        # quoted (csv.reader path)
+        ('a,"b, c"\r\n"d ""e"""\n', 'a,b, c\nd "e"'),
+        ('"multi\nline",x\n', "multi\nline,x"),
+    ],
+)
+def test_parse_csv(data, expected):
+    assert parse_csv(data) == expected
+
+    # both paths return what re-joining the csv.reader rows returns
+    rows = csv.reader(io.StringIO(data))
+    assert parse_csv(data) == "\n".join(",".join(row) for row in rows)
+
+
+def test_parse_html():
+    html = (
+        "<html><head><title>Report</title><style>p {color: red}</style></head>"
+        "<body><h1>Title</h1><p>First <b>bold</b> paragraph.</p>"
+        "<script>var x = 1;</script><div>Second</div>\n"
+        "<ul><li>one</li> <li>two</li></ul></body></html>"
+    )
+
+    # script and style contents are dropped; block elements are not separated,
+    # only whitespace present in the source is kept
+    assert parse_html(html) == "ReportTitleFirst bold paragraph.Second\none two"
+
+
+def test_read_docx(tmp_path):
+    # the sample document is a single paragraph
+    text = read_docx(SAMPLE_DOCX_PATH)
+    assert text.startswith("Geachte inschrijver, De inschrijvingen")
+    assert text.endswith("in de bijlage bij deze brief.")
+    assert "\n" not in text
+
+    # same package, with a body of paragraphs containing tabs and line breaks
+    w = DOCX_NAMESPACE[1:-1]
+    document_xml = (
+        f'<w:document xmlns:w="{w}"><w:body>'
+        "<w:p><w:r><w:t>Name</w:t><w:tab/><w:t>Value</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>first line</w:t><w:br/><w:t>second line</w:t></w:r>"
+        "<w:r><w:t xml:space='preserve'> continued</w:t></w:r></w:p>"
+        "<w:p/>"
+        "<w:p><w:r><w:t>last</w:t></w:r></w:p>"
+        "</w:body></w:document>"
+    )
+    docx_path = tmp_path / "edited.docx"
+    with (
+        zipfile.ZipFile(SAMPLE_DOCX_PATH) as sample,
+        zipfile.ZipFile(docx_path, "w") as edited,
+    ):
+        for member in sample.infolist():
+            data = sample.read(member)
+            if member.filename == "word/document.xml":
+                data = document_xml.encode("utf-8")
+            edited.writestr(member, data)
+
+    assert read_docx(docx_path) == (
+        "Name\tValue\nfirst line\nsecond line continued\n\nlast"
+    )
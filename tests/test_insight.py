@@ -1,11 +1,18 @@
+import asyncio
+import shutil
 import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
-import aiofiles
 import pytest
+from fastapi import BackgroundTasks, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from httpx import AsyncClient
 from pytest import MonkeyPatch
+from sqlalchemy import func
 from sqlalchemy.future import select
 
+from docusight.file_utils import add_zipped_folder_to_database, generate_tmp_dir
 from docusight.models import Document
 from tests.conftest import (
     TEMP_DROPBOX_DIR,
@@ -48,25 +55,63 @@ async def test_insight_endpoint(
 
     # Assert number of documents in DB matches number of files in TEMP_DROPBOX_DIR
     user = await mock_get_user(db, None)
-    docs_result = await db.execute(select(Document).where(Document.user_id == user.id))
-    db_docs = docs_result.fetchall()
+    docs_result = await db.execute(
+        select(func.count()).select_from(Document).where(Document.user_id == user.id)
+    )
+    num_db_docs = docs_result.scalar_one()
     dropbox_files = list(TEMP_DROPBOX_DIR.glob("*"))
-    assert len(db_docs) == len(dropbox_files)
+    assert num_db_docs == len(dropbox_files)
+
 
+async def mock_upload_files_to_dropbox(dropbox_client, file_paths, tmp_dir, file_sizes):
+    TEMP_DROPBOX_DIR.mkdir(parents=True, exist_ok=True)
 
-async def mock_upload_files_to_dropbox(dropbox_client, file_paths, tmp_dir):
-    dropbox_paths = {}
-    for file_path in file_paths:
-        TEMP_DROPBOX_DIR.mkdir(parents=True, exist_ok=True)
+    async def copy_file(file_path):
         file_id = str(uuid.uuid4())
-        file_ext = "." + file_path.name.split(".")[-1] if "." in file_path.name else ""
-        mock_dropbox_filename = f"{file_id}{file_ext}"
+        mock_dropbox_filename = f"{file_id}{file_path.suffix}"
         dest = TEMP_DROPBOX_DIR / mock_dropbox_filename
-        async with (
-            aiofiles.open(file_path, "rb") as src,
-            aiofiles.open(dest, "wb") as dst,
-        ):
-            content = await src.read()
-            await dst.write(content)
-        dropbox_paths[file_path.relative_to(tmp_dir)] = str(dest)
-    return dropbox_paths
+        await run_in_threadpool(shutil.copyfile, file_path, dest)
+        return file_path.relative_to(tmp_dir), str(dest)
+
+    # copy files concurrently
+    return dict(await asyncio.gather(*(copy_file(fp) for fp in file_paths)))
+
+
+@pytest.mark.asyncio
+async def test_failed_folder_add_deletes_uploads(monkeypatch: MonkeyPatch):
+    uploaded_paths = {}
+    deleted_paths = []
+
+    async def mock_upload(dropbox_client, file_paths, tmp_dir, file_sizes):
+        uploaded_paths.update(
+            {path.relative_to(tmp_dir): f"/uploads/{path.name}" for path in file_paths}
+        )
+        return uploaded_paths
+
+    async def mock_add_folder_to_database(**kwargs):
+        raise Exception("mock database failure")
+
+    async def mock_delete_dropbox_files(dropbox_client, dropbox_paths):
+        deleted_paths.extend(dropbox_paths)
+
+    monkeypatch.setattr("docusight.file_utils.upload_files_to_dropbox", mock_upload)
+    monkeypatch.setattr(
+        "docusight.file_utils.add_folder_to_database", mock_add_folder_to_database
+    )
+    monkeypatch.setattr(
+        "docusight.file_utils.delete_dropbox_files", mock_delete_dropbox_files
+    )
+
+    user = SimpleNamespace(id=0, display_name="Failing User")
+    db = SimpleNamespace(rollback=AsyncMock())
+    with ZIPPED_FOLDER_PATH.open("rb") as f:
+        zipped_folder = UploadFile(f, filename=ZIPPED_FOLDER_PATH.name)
+        with pytest.raises(HTTPException):
+            await add_zipped_folder_to_database(
+                zipped_folder, db, None, user, True, BackgroundTasks()
+            )
+
+    assert uploaded_paths
+    assert sorted(deleted_paths) == sorted(uploaded_paths.values())
+    db.rollback.assert_awaited_once()
+    assert not (generate_tmp_dir(user) / "sample").exists()